@@ -0,0 +1,105 @@
+"""
+Agregações dos registros coletados em uma única passada
+Totais por perfil, por plataforma e gerais, usados pelo export_to_excel e pelo
+get_statistics de SocialMediaScraper
+"""
+
+from typing import Dict, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from record_store import RecordStore
+
+# Contadores somados por grupo
+SUM_COLUMNS = ('likes', 'comentarios', 'visualizacoes', 'duracao_segundos')
+
+
+class Aggregates(NamedTuple):
+    """Resultado de aggregate()"""
+    por_perfil: pd.DataFrame        # Índice (plataforma, perfil), em ordem alfabética
+    por_plataforma: pd.DataFrame    # Índice plataforma, em ordem alfabética
+    total: Dict                     # Métricas gerais
+    posicoes: Dict[str, np.ndarray]  # Posições dos registros de cada plataforma, em ordem
+
+
+def _with_missing(codes: np.ndarray, categories: list):
+    """Códigos sem -1: valores ausentes viram uma categoria None no fim da lista"""
+    if len(codes) and codes.min() < 0:
+        codes = np.where(codes < 0, len(categories), codes)
+        categories = categories + [None]
+    return codes, categories
+
+
+def aggregate(store: RecordStore) -> Aggregates:
+    """
+    Calcula todas as métricas com uma única leitura dos buffers do store
+
+    Cada registro é atribuído ao grupo (plataforma, perfil) pelos códigos das
+    categorias; somas, contagens, mínimos e máximos são acumulados por grupo
+    com numpy. Os totais por plataforma e gerais saem dos grupos, que são poucos.
+
+    Colunas de por_perfil e por_plataforma: posts, likes, comentarios,
+    visualizacoes, duracao_total, duracao_min, duracao_max.
+    """
+    plataforma_codes, plataformas = _with_missing(*store.category_codes('plataforma'))
+    perfil_codes, perfis = _with_missing(*store.category_codes('perfil'))
+    duracao = store.column('duracao_segundos')
+
+    # Grupo de cada registro: (plataforma, perfil) combinados num único inteiro
+    keys = plataforma_codes.astype(np.int64) * max(len(perfis), 1) + perfil_codes
+    groups, inverse = np.unique(keys, return_inverse=True)
+    n_groups = len(groups)
+
+    columns = {'posts': np.bincount(inverse, minlength=n_groups)}
+    for column, name in zip(SUM_COLUMNS, ('likes', 'comentarios', 'visualizacoes', 'duracao_total')):
+        columns[name] = np.bincount(inverse, weights=store.column(column), minlength=n_groups).round().astype(np.int64)
+
+    duracao_min = np.full(n_groups, np.iinfo(np.int64).max, dtype=np.int64)
+    duracao_max = np.full(n_groups, np.iinfo(np.int64).min, dtype=np.int64)
+    np.minimum.at(duracao_min, inverse, duracao)
+    np.maximum.at(duracao_max, inverse, duracao)
+    columns['duracao_min'] = duracao_min
+    columns['duracao_max'] = duracao_max
+
+    index = pd.MultiIndex.from_arrays(
+        [
+            [plataformas[code] for code in groups // max(len(perfis), 1)],
+            [perfis[code] for code in groups % max(len(perfis), 1)]
+        ],
+        names=['plataforma', 'perfil']
+    )
+    por_perfil = pd.DataFrame(columns, index=index).sort_index()
+
+    por_plataforma = por_perfil.groupby(level='plataforma').agg({
+        'posts': 'sum',
+        'likes': 'sum',
+        'comentarios': 'sum',
+        'visualizacoes': 'sum',
+        'duracao_total': 'sum',
+        'duracao_min': 'min',
+        'duracao_max': 'max'
+    })
+
+    total_posts = len(store)
+    # Somados a partir dos grupos (incluem registros sem plataforma, que o groupby descarta)
+    total = {
+        'total_posts': total_posts,
+        'total_likes': int(por_perfil['likes'].sum()),
+        'total_comentarios': int(por_perfil['comentarios'].sum()),
+        'total_visualizacoes': int(por_perfil['visualizacoes'].sum()),
+        'duracao_total': int(por_perfil['duracao_total'].sum()),
+        'perfis_unicos': por_perfil.index.get_level_values('perfil').dropna().nunique()
+    }
+
+    # Registros de cada plataforma na ordem original (ordenação estável pelos códigos);
+    # registros sem plataforma não entram em nenhuma aba
+    ordem = np.argsort(plataforma_codes, kind='stable')
+    limites = np.searchsorted(plataforma_codes[ordem], np.arange(len(plataformas) + 1))
+    posicoes = {
+        plataformas[code]: ordem[limites[code]:limites[code + 1]]
+        for code in range(len(plataformas))
+        if limites[code + 1] > limites[code] and plataformas[code] is not None
+    }
+
+    return Aggregates(por_perfil, por_plataforma, total, posicoes)
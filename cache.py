@@ -0,0 +1,207 @@
+"""
+Caches persistentes (SQLite): respostas da API do YouTube e metadados de URLs
+Evitam repetir consultas e extrações dentro do prazo de validade (TTL)
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+# Validade padrão (segundos) de cada endpoint da YouTube Data API
+DEFAULT_TTLS = {
+    'search': 6 * 3600,   # Resultados de busca mudam devagar
+    'videos': 3600        # Estatísticas mudam mais rápido
+}
+
+# Parâmetros que não fazem parte da chave do cache
+IGNORED_PARAMS = {'key'}
+
+
+class ResponseCache:
+    """Cache de respostas JSON em SQLite com TTL por endpoint e despejo LRU"""
+
+    def __init__(self, path: str = 'youtube_cache.sqlite', ttls: Optional[Dict[str, int]] = None,
+                 default_ttl: int = 3600, max_entries: int = 10000):
+        """
+        Args:
+            path: Arquivo SQLite do cache
+            ttls: Validade em segundos por endpoint (ex: {'search': 21600})
+            default_ttl: Validade de endpoints sem TTL próprio
+            max_entries: Máximo de respostas guardadas; as menos usadas são descartadas
+        """
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict) -> str:
+        """Chave normalizada: endpoint + parâmetros ordenados, sem a API key"""
+        normalized = {k: str(v) for k, v in params.items() if k not in IGNORED_PARAMS}
+        raw = json.dumps([endpoint, normalized], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        """Retorna a resposta guardada, ou None se não existir ou tiver expirado"""
+        key = self.make_key(endpoint, params)
+        ttl = self.ttls.get(endpoint, self.default_ttl)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > ttl:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def set(self, endpoint: str, params: Dict, body: Dict):
+        """Guarda uma resposta e descarta as menos usadas se passar de max_entries"""
+        key = self.make_key(endpoint, params)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, body, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, endpoint, json.dumps(body, ensure_ascii=False), now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """Remove todas as respostas guardadas"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """Contadores de acertos/falhas e tamanho atual do cache"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': entries
+        }
+
+    def close(self):
+        """Fecha a conexão com o arquivo SQLite"""
+        with self._lock:
+            self._conn.close()
+
+
+# Validade padrão (segundos) dos metadados de URLs
+METADATA_TTL = 30 * 24 * 3600       # Duração/título/criador praticamente não mudam
+METADATA_FAILURE_TTL = 3600          # Falhas (bloqueio, vídeo fora do ar) são tentadas de novo logo
+
+
+class MetadataCache:
+    """Cache em SQLite dos metadados extraídos de URLs, por (plataforma, id do vídeo)"""
+
+    def __init__(self, path: str = 'metadata_cache.sqlite', ttl: int = METADATA_TTL,
+                 failure_ttl: int = METADATA_FAILURE_TTL):
+        """
+        Args:
+            path: Arquivo SQLite do cache
+            ttl: Validade em segundos de extrações bem-sucedidas
+            failure_ttl: Validade em segundos de extrações com erro
+        """
+        self.path = path
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS metadata (
+                plataforma TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                resultado TEXT NOT NULL,
+                ok INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (plataforma, video_id)
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, plataforma: str, video_id: str) -> Optional[Dict]:
+        """Resultado guardado de extrair_duracao_url, ou None se ausente/expirado"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT resultado, ok, created_at FROM metadata WHERE plataforma = ? AND video_id = ?",
+                (plataforma, video_id)
+            ).fetchone()
+
+            ttl = (self.ttl if row[1] else self.failure_ttl) if row else 0
+            if row is None or time.time() - row[2] > ttl:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def set(self, plataforma: str, video_id: str, resultado: Dict):
+        """Guarda o resultado de extrair_duracao_url"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata (plataforma, video_id, resultado, ok, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (plataforma, video_id, json.dumps(resultado, ensure_ascii=False),
+                 int(resultado.get('status') == 'ok'), time.time())
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """Contadores de acertos/falhas e tamanho atual do cache"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': entries
+        }
+
+    def close(self):
+        """Fecha a conexão com o arquivo SQLite"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,237 @@
+"""
+Linha de comando (sem interface) para processamento em lote
+Lê CSV/XLSX em blocos, processa URLs ou hashtags com o mesmo motor do dashboard
+e grava os resultados em CSV/JSONL/Parquet à medida que ficam prontos (memória constante,
+adequado para cron)
+
+Exemplos:
+    python cli.py urls planilha.xlsx --coluna URL --saida minutagem.csv --tempo-minimo 1
+    python cli.py hashtags tecnologia python --saida coleta.jsonl --incremental
+    python cli.py hashtags --entrada hashtags.csv --coluna hashtag --saida coleta.csv
+"""
+
+import argparse
+import hashlib
+import sys
+import time
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+from cache import MetadataCache
+from domain_scheduler import DomainScheduler
+from exporters import open_exporter
+from job_journal import JobJournal
+from social_media_scraper import SocialMediaScraper
+from url_extractor import DEFAULT_WORKERS, processar_urls
+
+# Linhas lidas/gravadas por bloco
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def ler_em_blocos(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Lê um CSV ou XLSX em DataFrames de até chunk_size linhas
+
+    O XLSX é lido em modo read_only do openpyxl, linha a linha, sem carregar
+    a planilha inteira na memória.
+    """
+    if path.lower().endswith('.csv'):
+        yield from pd.read_csv(path, chunksize=chunk_size)
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        columns = [str(c) if c is not None else f'coluna_{i}' for i, c in enumerate(header)]
+        bloco = []
+        for row in rows:
+            bloco.append(row)
+            if len(bloco) == chunk_size:
+                yield pd.DataFrame(bloco, columns=columns)
+                bloco = []
+        if bloco:
+            yield pd.DataFrame(bloco, columns=columns)
+    finally:
+        workbook.close()
+
+
+def hash_arquivo(path: str) -> bytes:
+    """SHA-256 do arquivo, lido em blocos (entrada do JobJournal.make_job_id)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            digest.update(bloco)
+    return digest.digest()
+
+
+def comando_urls(args) -> int:
+    """Extrai a minutagem das URLs de uma planilha, bloco a bloco"""
+    cache = MetadataCache(args.cache)
+    journal = JobJournal(args.journal) if args.journal else None
+    segundos_minimo = args.tempo_minimo * 60
+    # Limites e disjuntores por domínio valem para o arquivo inteiro, não por bloco
+    scheduler = DomainScheduler(max_per_domain=args.workers)
+    job_base = None
+    if journal:
+        job_base = JobJournal.make_job_id(
+            hash_arquivo(args.entrada),
+            coluna_url=args.coluna,
+            tempo_minimo_seg=segundos_minimo,
+            chunk_size=args.chunk_size
+        )
+
+    sucesso = 0
+    erro = 0
+    inicio = time.time()
+
+    try:
+        with open_exporter(args.saida) as saida:
+            for n, bloco in enumerate(ler_em_blocos(args.entrada, args.chunk_size)):
+                if args.coluna not in bloco.columns:
+                    print(f"❌ Coluna '{args.coluna}' não encontrada em {args.entrada}", file=sys.stderr)
+                    return 2
+
+                resultado = processar_urls(
+                    bloco, args.coluna, segundos_minimo,
+                    max_workers=args.workers,
+                    cache=cache,
+                    youtube_api_key=args.youtube_key,
+                    journal=journal,
+                    job_id=f'{job_base}:{n}' if journal else None,
+                    scheduler=scheduler
+                )
+                saida.write(resultado['df'])
+                sucesso += resultado['sucesso']
+                erro += resultado['erro']
+                print(f"📦 {saida.rows} linhas gravadas (sucesso: {sucesso} | erro: {erro})")
+    finally:
+        cache.close()
+        if journal:
+            journal.close()
+
+    print(f"✅ Concluído em {time.time() - inicio:.1f}s: {args.saida}")
+    return 0 if erro == 0 or not args.falhar_com_erros else 1
+
+
+class ColunaAusente(Exception):
+    """Coluna informada em --coluna não existe no arquivo de entrada"""
+
+    def __init__(self, coluna: str, path: str):
+        super().__init__(f"Coluna '{coluna}' não encontrada em {path}")
+
+
+def ler_hashtags(args) -> Iterator[str]:
+    """Hashtags da linha de comando e/ou da coluna de um arquivo, sem repetição"""
+    vistas = set()
+
+    def novas(valores):
+        for valor in valores:
+            if pd.isna(valor):
+                continue
+            hashtag = str(valor).strip().lstrip('#')
+            if hashtag and hashtag.lower() not in vistas:
+                vistas.add(hashtag.lower())
+                yield hashtag
+
+    yield from novas(args.hashtags)
+    if args.entrada:
+        for bloco in ler_em_blocos(args.entrada, args.chunk_size):
+            if args.coluna not in bloco.columns:
+                raise ColunaAusente(args.coluna, args.entrada)
+            yield from novas(bloco[args.coluna])
+
+
+def comando_hashtags(args) -> int:
+    """Busca cada hashtag em todas as plataformas, gravando os registros em streaming"""
+    if not args.hashtags and not args.entrada:
+        print("❌ Informe hashtags ou --entrada com uma coluna de hashtags", file=sys.stderr)
+        return 2
+
+    scraper = SocialMediaScraper()
+    if args.youtube_key:
+        scraper.configure_apis(youtube_key=args.youtube_key)
+        scraper.configure_cache()
+
+    segundos_minimo = args.tempo_minimo * 60
+    inicio = time.time()
+
+    try:
+        with open_exporter(args.saida) as saida:
+            for hashtag in ler_hashtags(args):
+                print(f"🔍 #{hashtag}")
+                bloco = []
+                for record in scraper.iter_all_platforms(hashtag, args.max_results, incremental=args.incremental):
+                    if record['duracao_segundos'] < segundos_minimo:
+                        continue
+                    bloco.append(record)
+                    if len(bloco) == args.chunk_size:
+                        saida.write(bloco)
+                        bloco = []
+                saida.write(bloco)
+                print(f"📦 {saida.rows} registros gravados")
+    except ColunaAusente as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    finally:
+        if scraper.cache:
+            scraper.cache.close()
+
+    print(f"✅ Concluído em {time.time() - inicio:.1f}s: {args.saida}")
+    return 0
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Processamento em lote de URLs e hashtags (YouTube, Instagram, TikTok)"
+    )
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    urls = subparsers.add_parser('urls', help="Extrai a minutagem das URLs de uma planilha CSV/XLSX")
+    urls.add_argument('entrada', help="Planilha de entrada (.csv ou .xlsx)")
+    urls.add_argument('--coluna', default='url', help="Coluna com as URLs (padrão: url)")
+    urls.add_argument('--saida', required=True, help="Arquivo de saída (.csv, .jsonl ou .parquet)")
+    urls.add_argument('--tempo-minimo', type=float, default=1.0,
+                      help="Minutagem mínima em minutos para marcar como monetizável (padrão: 1)")
+    urls.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Extrações simultâneas")
+    urls.add_argument('--youtube-key', help="Resolve links do YouTube pela API em vez do yt-dlp")
+    urls.add_argument('--cache', default='metadata_cache.sqlite', help="Cache de metadados (SQLite)")
+    urls.add_argument('--journal', default='jobs.sqlite',
+                      help="Diário para retomar execuções interrompidas ('' desativa)")
+    urls.add_argument('--falhar-com-erros', action='store_true',
+                      help="Sai com código 1 se alguma URL falhar")
+    urls.set_defaults(func=comando_urls)
+
+    hashtags = subparsers.add_parser('hashtags', help="Busca hashtags em todas as plataformas")
+    hashtags.add_argument('hashtags', nargs='*', help="Hashtags (sem #)")
+    hashtags.add_argument('--entrada', help="Planilha (.csv ou .xlsx) com uma coluna de hashtags")
+    hashtags.add_argument('--coluna', default='hashtag', help="Coluna com as hashtags (padrão: hashtag)")
+    hashtags.add_argument('--saida', required=True, help="Arquivo de saída (.csv, .jsonl ou .parquet)")
+    hashtags.add_argument('--max-results', type=int, default=30, help="Resultados por plataforma")
+    hashtags.add_argument('--tempo-minimo', type=float, default=0.0,
+                          help="Descarta vídeos abaixo desta minutagem (minutos)")
+    hashtags.add_argument('--youtube-key', help="API Key do YouTube (sem ela, dados de exemplo)")
+    hashtags.add_argument('--incremental', action='store_true',
+                          help="Busca só vídeos do YouTube publicados desde a última coleta")
+    hashtags.set_defaults(func=comando_hashtags)
+
+    for sub in (urls, hashtags):
+        sub.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                         help=f"Linhas por bloco (padrão: {DEFAULT_CHUNK_SIZE})")
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = criar_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,16 @@ YouTube, Instagram, TikTok: Busca por hashtag OU upload de planilha
 
 import streamlit as st
 import pandas as pd
-import subprocess
+import hashlib
+import io
 import json
 import time
 from datetime import datetime
 from social_media_scraper import SocialMediaScraper
+from url_extractor import processar_urls, yt_dlp_disponivel, DEFAULT_WORKERS
+from cache import MetadataCache, ResponseCache
+from job_journal import JobJournal
+from job_runner import JobRunner, ERRO
 
 st.set_page_config(
     page_title="Dashboard Completo",
@@ -18,113 +23,165 @@ st.set_page_config(
 )
 
 
-def extrair_duracao_url(url):
-    """Extrai duração usando yt-dlp (sem API)"""
-    try:
-        cmd = ['yt-dlp', '--dump-json', '--no-playlist', '--no-warnings', url]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            duracao_seg = data.get('duration', 0)
-            
-            if duracao_seg:
-                horas = int(duracao_seg // 3600)
-                minutos = int((duracao_seg % 3600) // 60)
-                segundos = int(duracao_seg % 60)
-                
-                if horas > 0:
-                    duracao_fmt = f"{horas:02d}:{minutos:02d}:{segundos:02d}"
-                else:
-                    duracao_fmt = f"{minutos:02d}:{segundos:02d}"
-                
-                # Extrair título se disponível
-                titulo = data.get('title', 'Sem título')
-                criador = data.get('uploader', data.get('channel', 'Desconhecido'))
-                
-                return {
-                    'segundos': duracao_seg,
-                    'formatada': duracao_fmt,
-                    'titulo': titulo,
-                    'criador': criador,
-                    'status': 'ok'
-                }
-        
-        return {'segundos': 0, 'formatada': 'Erro', 'status': 'erro'}
-    
-    except Exception as e:
-        return {'segundos': 0, 'formatada': 'Erro', 'status': f'erro: {str(e)}'}
+@st.cache_resource
+def obter_cache_metadados():
+    """Cache de metadados de URLs compartilhado por todas as sessões"""
+    return MetadataCache('metadata_cache.sqlite')
 
 
-def processar_upload(df, coluna_url, tempo_minimo_seg):
-    """Processa planilha de URLs e extrai minutagem"""
+@st.cache_resource
+def obter_cache_respostas():
+    """Cache de respostas da API do YouTube compartilhado por todas as sessões"""
+    return ResponseCache('youtube_cache.sqlite')
+
+
+@st.cache_resource
+def obter_journal():
+    """Diário de jobs de upload compartilhado por todas as sessões"""
+    return JobJournal('jobs.sqlite')
+
+
+@st.cache_resource
+def obter_runner():
+    """Pool de jobs em segundo plano compartilhado por todas as sessões"""
+    return JobRunner()
+
+
+def acompanhar_job(chave):
+    """
+    Mostra o andamento do job da sessão guardado em st.session_state[chave]
     
-    if coluna_url not in df.columns:
-        st.error(f"❌ Coluna '{coluna_url}' não encontrada")
+    Returns:
+        O job, quando concluído com sucesso; None enquanto roda ou se falhou
+    """
+    job_id = st.session_state.get(chave)
+    job = obter_runner().get(job_id) if job_id else None
+    
+    if job is None:
         return None
     
-    # Criar colunas resultado
-    df['Plataforma'] = ''
-    df['Criador'] = ''
-    df['Título'] = ''
-    df['Duração (seg)'] = 0
-    df['Duração'] = ''
-    df['Status'] = ''
-    df['Monetizável'] = ''
+    if job.ativo:
+        st.progress(min(job.concluidas / job.total, 1.0) if job.total else 0.0)
+        st.caption(f"⏳ {job.descricao}: {job.concluidas}/{job.total or '?'} {job.mensagem[:50]}")
+        return None
     
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    if job.status == ERRO:
+        st.error(f"❌ Erro: {job.erro}")
+        return None
     
-    total = len(df)
-    sucesso = 0
-    erro = 0
+    return job
+
+
+def ha_jobs_ativos():
+    """Indica se algum job submetido nesta sessão ainda está na fila ou rodando"""
+    runner = obter_runner()
+    for chave, job_id in st.session_state.items():
+        if str(chave).startswith('job_'):
+            job = runner.get(job_id)
+            if job is not None and job.ativo:
+                return True
+    return False
+
+
+def fingerprint_dados(dados):
+    """Impressão digital do conjunto de dados (DataFrame ou lista de registros)"""
+    digest = hashlib.sha256()
+    if isinstance(dados, pd.DataFrame):
+        digest.update(json.dumps([str(c) for c in dados.columns], ensure_ascii=False).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(dados, index=False).values.tobytes())
+    else:
+        digest.update(json.dumps(dados, sort_keys=True, default=str, ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()
+
+
+@st.cache_data(max_entries=32, show_spinner="Gerando Excel...")
+def excel_busca(fingerprint, _data, **opcoes):
+    """
+    Excel da busca por hashtag (SocialMediaScraper.export_to_excel), em memória
     
-    for idx, row in df.iterrows():
-        url = str(row[coluna_url]).strip()
-        
-        if pd.isna(url) or url == '' or url == 'nan':
-            df.at[idx, 'Status'] = 'URL vazia'
-            continue
-        
-        status_text.text(f"Processando {idx + 1}/{total}: {url[:50]}...")
-        
-        # Identificar plataforma
-        if 'tiktok.com' in url.lower():
-            plataforma = 'TikTok'
-        elif 'instagram.com' in url.lower():
-            plataforma = 'Instagram'
-        elif 'youtube.com' in url.lower() or 'youtu.be' in url.lower():
-            plataforma = 'YouTube'
-        else:
-            plataforma = 'Outra'
-        
-        df.at[idx, 'Plataforma'] = plataforma
-        
-        # Extrair duração
-        resultado = extrair_duracao_url(url)
-        
-        df.at[idx, 'Duração (seg)'] = resultado['segundos']
-        df.at[idx, 'Duração'] = resultado['formatada']
-        df.at[idx, 'Status'] = resultado['status']
-        
-        if resultado['status'] == 'ok':
-            df.at[idx, 'Criador'] = resultado.get('criador', 'Desconhecido')
-            df.at[idx, 'Título'] = resultado.get('titulo', 'Sem título')
-            df.at[idx, 'Monetizável'] = '✅' if resultado['segundos'] >= tempo_minimo_seg else '❌'
-            sucesso += 1
-        else:
-            df.at[idx, 'Monetizável'] = '❌'
-            erro += 1
-        
-        progress_bar.progress((idx + 1) / total)
-        time.sleep(0.5)
+    Cacheado pela impressão digital dos dados e pelas opções de exportação:
+    os reruns da página reaproveitam os bytes em vez de gerar o arquivo de novo.
+    """
+    scraper = SocialMediaScraper()
+    scraper.data = _data
+    return scraper.export_to_excel_bytes(**opcoes)
+
+
+@st.cache_data(max_entries=32, show_spinner="Gerando Excel...")
+def excel_upload(fingerprint, _df, **opcoes):
+    """Planilha de upload com a minutagem, em memória (cacheada como excel_busca)"""
+    buffer = io.BytesIO()
+    _df.to_excel(buffer, **opcoes)
+    return buffer.getvalue()
+
+
+def executar_upload(job, df, coluna_url, tempo_minimo_seg, max_workers, youtube_api_key, cache, journal):
+    """Job de fundo: extrai a minutagem da planilha (sem chamadas st.*)"""
+    return processar_urls(
+        df, coluna_url, tempo_minimo_seg,
+        max_workers=max_workers,
+        on_progress=job.progress,
+        cache=cache,
+        youtube_api_key=youtube_api_key,
+        journal=journal,
+        job_id=job.job_id
+    )
+
+
+def executar_busca(job, plataforma, hashtag, max_results, tempo_minimo, api_key, cache):
+    """Job de fundo: busca por hashtag e filtra por minutagem (sem chamadas st.*)"""
+    segundos_minimo = tempo_minimo * 60
+    scraper = SocialMediaScraper()
+    
+    if api_key:
+        scraper.configure_apis(youtube_key=api_key)
+        # Buscas repetidas dentro do TTL não gastam quota
+        scraper.cache = cache
     
-    progress_bar.empty()
-    status_text.empty()
+    # Buscar apenas na plataforma específica (em streaming, página a página)
+    if plataforma == "YouTube":
+        videos = scraper.iter_youtube(hashtag, max_results)
+    elif plataforma == "Instagram":
+        videos = scraper.iter_instagram(hashtag, max_results)
+    else:  # TikTok
+        videos = scraper.iter_tiktok(hashtag, max_results)
     
-    st.success(f"✅ Concluído! Sucesso: {sucesso} | Erro: {erro}")
+    # Filtrar por minutagem conforme os vídeos chegam
+    total_encontrado = 0
+    data_filtrada = []
     
-    return df
+    for video in videos:
+        total_encontrado += 1
+        if video['duracao_segundos'] >= segundos_minimo:
+            data_filtrada.append(video)
+        job.progress(total_encontrado, max_results, f"{len(data_filtrada)} ≥ {tempo_minimo} min")
+    
+    return {
+        'data': data_filtrada,
+        'total_encontrado': total_encontrado,
+        'hashtag': hashtag,
+        'tempo_minimo': tempo_minimo
+    }
+
+
+def processar_upload(df, coluna_url, tempo_minimo_seg, job_id, max_workers=DEFAULT_WORKERS, youtube_api_key=None):
+    """Envia a planilha para extração em segundo plano e devolve o job"""
+    
+    if coluna_url not in df.columns:
+        st.error(f"❌ Coluna '{coluna_url}' não encontrada")
+        return None
+    
+    journal = obter_journal()
+    status_job = journal.status(job_id)
+    if status_job and status_job['concluidas'] and not status_job['finalizado']:
+        st.info(f"♻️ Retomando processamento: {status_job['concluidas']} linhas já concluídas")
+    
+    return obter_runner().submit(
+        job_id, executar_upload,
+        df, coluna_url, tempo_minimo_seg, max_workers, youtube_api_key,
+        obter_cache_metadados(), journal,
+        descricao=f"Extraindo {len(df)} URLs"
+    )
 
 
 def tab_api(plataforma):
@@ -151,9 +208,10 @@ def tab_api(plataforma):
             )
         
         with col2:
+            # YouTube pagina a busca, então aceita mais de 50 resultados
             max_results = st.slider(
                 "Máximo de resultados",
-                10, 50, 20, 5,
+                10, 500 if plataforma == "YouTube" else 50, 20, 5,
                 key=f"max_{plataforma}"
             )
         
@@ -171,74 +229,70 @@ def tab_api(plataforma):
         submit = st.form_submit_button("🚀 Buscar")
     
     if submit and hashtag:
-        segundos_minimo = tempo_minimo * 60
-        
-        with st.spinner(f"Buscando no {plataforma}..."):
-            try:
-                scraper = SocialMediaScraper()
+        # Cada busca roda de novo (os resultados mudam e uma chave inválida cai nos
+        # dados de exemplo); o id só evita buscas duplicadas em andamento
+        job = obter_runner().submit(
+            JobRunner.make_job_id(
+                tipo='busca', plataforma=plataforma, hashtag=hashtag,
+                max_results=max_results, tempo_minimo=tempo_minimo,
+                api_key=hashlib.sha256(api_key.encode('utf-8')).hexdigest() if api_key else None
+            ),
+            executar_busca, plataforma, hashtag, max_results, tempo_minimo, api_key,
+            obter_cache_respostas(),
+            descricao=f"Buscando #{hashtag} no {plataforma}",
+            reutilizar_concluido=False
+        )
+        st.session_state[f'job_api_{plataforma}'] = job.job_id
+    
+    elif submit:
+        st.warning("⚠️ Digite a hashtag")
+    
+    job = acompanhar_job(f'job_api_{plataforma}')
+    
+    if job:
+        try:
+            resultado = job.resultado
+            data_filtrada = resultado['data']
+            hashtag = resultado['hashtag']
+            tempo_minimo = resultado['tempo_minimo']
+            
+            if len(data_filtrada) == 0:
+                st.warning(f"⚠️ Nenhum vídeo ≥ {tempo_minimo} min")
+                st.info(f"Total encontrado: {resultado['total_encontrado']}, todos abaixo de {tempo_minimo} min")
+            else:
+                # Salvar nos session_state específicos da plataforma
+                st.session_state[f'data_{plataforma}'] = data_filtrada
+                
+                st.success(f"✅ {len(data_filtrada)} vídeos encontrados (≥ {tempo_minimo} min)")
                 
-                if api_key:
-                    scraper.configure_apis(youtube_key=api_key)
+                # Mostrar resultado
+                df = pd.DataFrame(data_filtrada)
                 
-                # Buscar apenas na plataforma específica
-                if plataforma == "YouTube":
-                    data_raw = scraper.search_youtube(hashtag, max_results)
-                elif plataforma == "Instagram":
-                    data_raw = scraper.search_instagram(hashtag, max_results)
-                else:  # TikTok
-                    data_raw = scraper.search_tiktok(hashtag, max_results)
+                df_display = df[[
+                    'perfil', 'titulo', 'duracao_formatada',
+                    'likes', 'comentarios', 'data_publicacao', 'url'
+                ]].copy()
                 
-                # Filtrar por minutagem
-                data_filtrada = [
-                    video for video in data_raw 
-                    if video['duracao_segundos'] >= segundos_minimo
+                df_display.columns = [
+                    'Criador', 'Título', 'Duração',
+                    'Likes', 'Comentários', 'Data', 'URL'
                 ]
                 
-                if len(data_filtrada) == 0:
-                    st.warning(f"⚠️ Nenhum vídeo ≥ {tempo_minimo} min")
-                    st.info(f"Total encontrado: {len(data_raw)}, todos abaixo de {tempo_minimo} min")
-                else:
-                    # Salvar nos session_state específicos da plataforma
-                    st.session_state[f'data_{plataforma}'] = data_filtrada
-                    st.session_state[f'hashtag_{plataforma}'] = hashtag
-                    st.session_state[f'tempo_{plataforma}'] = tempo_minimo
-                    
-                    st.success(f"✅ {len(data_filtrada)} vídeos encontrados (≥ {tempo_minimo} min)")
-                    
-                    # Mostrar resultado
-                    df = pd.DataFrame(data_filtrada)
-                    
-                    df_display = df[[
-                        'perfil', 'titulo', 'duracao_formatada',
-                        'likes', 'comentarios', 'data_publicacao', 'url'
-                    ]].copy()
-                    
-                    df_display.columns = [
-                        'Criador', 'Título', 'Duração',
-                        'Likes', 'Comentários', 'Data', 'URL'
-                    ]
-                    
-                    st.dataframe(df_display, use_container_width=True, height=400)
-                    
-                    # Download
-                    scraper.data = data_filtrada
-                    filename = f"dados_{plataforma}_{hashtag}_{tempo_minimo}min.xlsx"
-                    scraper.export_to_excel(filename)
-                    
-                    with open(filename, 'rb') as f:
-                        st.download_button(
-                            "📥 Download Excel",
-                            f,
-                            file_name=filename,
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            key=f"download_api_{plataforma}"
-                        )
-            
-            except Exception as e:
-                st.error(f"❌ Erro: {str(e)}")
-    
-    elif submit:
-        st.warning("⚠️ Digite a hashtag")
+                st.dataframe(df_display, use_container_width=True, height=400)
+                
+                # Download (gerado em memória e cacheado entre reruns)
+                filename = f"dados_{plataforma}_{hashtag}_{tempo_minimo}min.xlsx"
+                
+                st.download_button(
+                    "📥 Download Excel",
+                    excel_busca(fingerprint_dados(data_filtrada), data_filtrada),
+                    file_name=filename,
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    key=f"download_api_{plataforma}"
+                )
+        
+        except Exception as e:
+            st.error(f"❌ Erro: {str(e)}")
 
 
 def tab_upload(plataforma):
@@ -289,6 +343,22 @@ def tab_upload(plataforma):
                     key=f"tempo_upload_{plataforma}"
                 )
             
+            max_workers = st.number_input(
+                "Extrações simultâneas",
+                min_value=1,
+                max_value=32,
+                value=DEFAULT_WORKERS,
+                help="Quantas URLs são processadas ao mesmo tempo pelo yt-dlp",
+                key=f"workers_{plataforma}"
+            )
+            
+            youtube_api_key = st.text_input(
+                "YouTube API Key (opcional)",
+                type="password",
+                help="Links do YouTube são resolvidos pela API em lotes de 50, sem yt-dlp",
+                key=f"upload_key_{plataforma}"
+            )
+            
             # Teste limitado
             limitar = st.checkbox(
                 "Processar apenas primeiras linhas (teste)",
@@ -310,10 +380,7 @@ def tab_upload(plataforma):
             
             if st.button(f"⏱️ Extrair Minutagem", key=f"extrair_{plataforma}"):
                 # Verificar yt-dlp
-                try:
-                    subprocess.run(['yt-dlp', '--version'], 
-                                 capture_output=True, check=True)
-                except:
+                if not yt_dlp_disponivel():
                     st.error("""
                     ❌ **yt-dlp não está instalado!**
                     
@@ -328,49 +395,66 @@ def tab_upload(plataforma):
                 
                 st.info(f"Processando {len(df_processar)} URLs...")
                 
-                df_resultado = processar_upload(df_processar, coluna_url, segundos_minimo)
-                
-                if df_resultado is not None:
-                    # Filtrar apenas monetizáveis
-                    df_monetizavel = df_resultado[df_resultado['Monetizável'] == '✅']
-                    
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.metric("Total Processado", len(df_resultado))
-                    
-                    with col2:
-                        st.metric("✅ Monetizáveis", len(df_monetizavel))
-                    
-                    with col3:
-                        perc = (len(df_monetizavel) / len(df_resultado) * 100) if len(df_resultado) > 0 else 0
-                        st.metric("% Monetizável", f"{perc:.1f}%")
-                    
-                    st.markdown("---")
-                    st.markdown("**Resultado:**")
-                    
-                    st.dataframe(
-                        df_resultado,
-                        use_container_width=True,
-                        height=400
-                    )
-                    
-                    # Download
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"{plataforma}_minutagem_{timestamp}.xlsx"
-                    df_resultado.to_excel(filename, index=False)
-                    
-                    with open(filename, 'rb') as f:
-                        st.download_button(
-                            "📥 Download Excel Atualizado",
-                            f,
-                            file_name=filename,
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            key=f"download_upload_{plataforma}"
-                        )
+                job = processar_upload(
+                    df_processar, coluna_url, segundos_minimo,
+                    job_id=JobJournal.make_job_id(
+                        uploaded.getvalue(),
+                        coluna_url=coluna_url,
+                        tempo_minimo_seg=segundos_minimo,
+                        linhas=len(df_processar)
+                    ),
+                    max_workers=max_workers,
+                    youtube_api_key=youtube_api_key or None
+                )
+                if job:
+                    st.session_state[f'job_upload_{plataforma}'] = job.job_id
         
         except Exception as e:
             st.error(f"❌ Erro: {str(e)}")
+    
+    job = acompanhar_job(f'job_upload_{plataforma}')
+    
+    if job:
+        resultado = job.resultado
+        df_resultado = resultado['df']
+        
+        st.success(f"✅ Concluído! Sucesso: {resultado['sucesso']} | Erro: {resultado['erro']}")
+        
+        # Filtrar apenas monetizáveis
+        df_monetizavel = df_resultado[df_resultado['Monetizável'] == '✅']
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Total Processado", len(df_resultado))
+        
+        with col2:
+            st.metric("✅ Monetizáveis", len(df_monetizavel))
+        
+        with col3:
+            perc = (len(df_monetizavel) / len(df_resultado) * 100) if len(df_resultado) > 0 else 0
+            st.metric("% Monetizável", f"{perc:.1f}%")
+        
+        st.markdown("---")
+        st.markdown("**Resultado:**")
+        
+        st.dataframe(
+            df_resultado,
+            use_container_width=True,
+            height=400
+        )
+        
+        # Download (gerado em memória e cacheado entre reruns)
+        timestamp = datetime.fromtimestamp(job.finalizado_em).strftime("%Y%m%d_%H%M%S")
+        filename = f"{plataforma}_minutagem_{timestamp}.xlsx"
+        
+        st.download_button(
+            "📥 Download Excel Atualizado",
+            excel_upload(fingerprint_dados(df_resultado), df_resultado, index=False),
+            file_name=filename,
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            key=f"download_upload_{plataforma}"
+        )
 
 
 def main():
@@ -434,6 +518,11 @@ def main():
     ### Feito com ❤️ por Maria Rita Casagrande
     
        """)
+    
+    # Enquanto houver job desta sessão em andamento, atualiza a página para mostrar o progresso
+    if ha_jobs_ativos():
+        time.sleep(1)
+        st.rerun()
 
 
 if __name__ == "__main__":
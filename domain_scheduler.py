@@ -0,0 +1,178 @@
+"""
+Concorrência adaptativa por domínio para a extração de URLs
+Cada domínio (YouTube, TikTok, Instagram...) tem seu próprio limite de extrações
+simultâneas, ajustado no estilo AIMD pela taxa de erros e pela latência, e um
+disjuntor (circuit breaker) que falha rápido durante uma pausa após falhas seguidas
+"""
+
+import time
+from typing import Callable, Dict
+
+# Limites de extrações simultâneas por domínio
+DEFAULT_INITIAL_LIMIT = 4
+DEFAULT_MIN_LIMIT = 1
+
+# Extrações mais lentas que isso (segundos) contam como sinal de congestionamento
+DEFAULT_LATENCY_TARGET = 10.0
+
+# Disjuntor: falhas seguidas até abrir e pausa (segundos) antes de tentar de novo
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN = 60.0
+
+# Estados do disjuntor
+FECHADO = 'fechado'
+ABERTO = 'aberto'
+MEIO_ABERTO = 'meio_aberto'
+
+
+class AIMDLimit:
+    """Limite de concorrência com aumento aditivo e redução multiplicativa"""
+
+    def __init__(self, initial: float = DEFAULT_INITIAL_LIMIT, minimum: float = DEFAULT_MIN_LIMIT,
+                 maximum: float = 8, decrease: float = 0.5,
+                 latency_target: float = DEFAULT_LATENCY_TARGET):
+        """
+        Args:
+            initial: Limite inicial
+            minimum: Limite mínimo (nunca para o domínio por completo)
+            maximum: Limite máximo
+            decrease: Fator aplicado ao limite em caso de erro ou lentidão
+            latency_target: Latência (segundos) acima da qual o sucesso conta como lentidão
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.limit = float(min(max(initial, minimum), maximum))
+
+    @property
+    def value(self) -> int:
+        """Limite atual (inteiro) de extrações simultâneas"""
+        return max(1, int(self.limit))
+
+    def on_success(self, latency: float):
+        """Sucesso rápido: +1 a cada janela completa; sucesso lento: reduz"""
+        if latency > self.latency_target:
+            self.on_failure()
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def on_failure(self):
+        """Erro ou lentidão: reduz o limite multiplicativamente"""
+        self.limit = max(self.minimum, self.limit * self.decrease)
+
+
+class CircuitBreaker:
+    """Disjuntor: abre após falhas seguidas e testa uma extração depois da pausa"""
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 cooldown: float = DEFAULT_COOLDOWN, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.state = FECHADO
+        self.failures = 0
+        self.opened_at = None
+
+    def allow(self, in_flight: int) -> bool:
+        """Indica se uma nova extração pode começar (no meio-aberto, só uma por vez)"""
+        if self.state == ABERTO and self.clock() - self.opened_at >= self.cooldown:
+            self.state = MEIO_ABERTO
+        if self.state == MEIO_ABERTO:
+            return in_flight == 0
+        return self.state == FECHADO
+
+    @property
+    def is_open(self) -> bool:
+        """Aberto e ainda dentro da pausa: extrações devem falhar na hora"""
+        return self.state == ABERTO and self.clock() - self.opened_at < self.cooldown
+
+    def record_success(self):
+        self.failures = 0
+        self.state = FECHADO
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == MEIO_ABERTO or self.failures >= self.failure_threshold:
+            self.state = ABERTO
+            self.opened_at = self.clock()
+
+
+class DomainScheduler:
+    """
+    Estado de concorrência de cada domínio: limite AIMD, extrações em andamento
+    e disjuntor
+
+    Usado apenas pela thread que distribui as extrações (ver
+    url_extractor.extrair_em_paralelo); não é thread-safe. Pode ser reaproveitado
+    entre chamadas para manter o que foi aprendido sobre cada domínio.
+    """
+
+    def __init__(self, max_per_domain: int = 8, initial: int = DEFAULT_INITIAL_LIMIT,
+                 latency_target: float = DEFAULT_LATENCY_TARGET,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 cooldown: float = DEFAULT_COOLDOWN, clock: Callable[[], float] = time.monotonic):
+        self.max_per_domain = max_per_domain
+        self.initial = initial
+        self.latency_target = latency_target
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._limits: Dict[str, AIMDLimit] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._in_flight: Dict[str, int] = {}
+
+    def can_start(self, domain: str) -> bool:
+        """Há vaga para mais uma extração do domínio e o disjuntor permite"""
+        in_flight = self._in_flight.get(domain, 0)
+        return in_flight < self._limit(domain).value and self._breaker(domain).allow(in_flight)
+
+    def is_open(self, domain: str) -> bool:
+        """Disjuntor do domínio aberto (extrações devem falhar na hora)"""
+        return self._breaker(domain).is_open
+
+    def started(self, domain: str):
+        self._in_flight[domain] = self._in_flight.get(domain, 0) + 1
+
+    def finished(self, domain: str, ok: bool, latency: float):
+        """
+        Registra o fim de uma extração e ajusta limite e disjuntor
+
+        ok=False apenas para sinais de bloqueio (timeout, 429...); erros do próprio
+        vídeo (privado, removido) contam como resposta normal do domínio.
+        """
+        self._in_flight[domain] -= 1
+        if ok:
+            self._limit(domain).on_success(latency)
+            self._breaker(domain).record_success()
+        else:
+            self._limit(domain).on_failure()
+            self._breaker(domain).record_failure()
+
+    def report(self) -> Dict[str, Dict]:
+        """Limite atual, extrações em andamento e estado do disjuntor por domínio"""
+        return {
+            domain: {
+                'limite': self._limits[domain].value,
+                'em_andamento': self._in_flight.get(domain, 0),
+                'disjuntor': self._breakers[domain].state
+            }
+            for domain in self._limits
+        }
+
+    # Métodos auxiliares
+
+    def _limit(self, domain: str) -> AIMDLimit:
+        if domain not in self._limits:
+            self._limits[domain] = AIMDLimit(
+                initial=min(self.initial, self.max_per_domain),
+                maximum=self.max_per_domain,
+                latency_target=self.latency_target
+            )
+        return self._limits[domain]
+
+    def _breaker(self, domain: str) -> CircuitBreaker:
+        if domain not in self._breakers:
+            self._breakers[domain] = CircuitBreaker(self.failure_threshold, self.cooldown, self.clock)
+            self._limit(domain)
+        return self._breakers[domain]
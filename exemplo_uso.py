@@ -139,10 +139,16 @@ def exemplo_comparacao_hashtags():
     
     resultados = {}
     
+    # Uma única coleta para todas as hashtags (vídeos repetidos são enriquecidos uma vez)
+    dados = scraper.search_many(hashtags, max_results_per_platform=15)
+    
     for hashtag in hashtags:
-        print(f"\n🔍 Analisando #{hashtag}...")
-        scraper.search_all_platforms(hashtag, max_results_per_platform=15)
-        resultados[hashtag] = scraper.get_statistics()
+        dados_hashtag = [d for d in dados if d['hashtag'] == hashtag]
+        resultados[hashtag] = {
+            'total_posts': len(dados_hashtag),
+            'total_likes': sum(d['likes'] for d in dados_hashtag),
+            'total_comentarios': sum(d['comentarios'] for d in dados_hashtag)
+        }
     
     # Comparação
     print("\n" + "="*60)
@@ -0,0 +1,209 @@
+"""
+Exportação em streaming para CSV, JSONL e Parquet
+Cada lote de registros é gravado assim que chega, sem montar um DataFrame com
+tudo; alternativa ao export_to_excel para volumes grandes e cargas em data warehouse
+"""
+
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Union
+
+import pandas as pd
+
+from record_store import RecordStore
+
+# Registros por lote em write_records
+DEFAULT_BATCH_SIZE = 10000
+
+# Colunas numéricas acrescentadas por url_extractor.processar_urls; as demais
+# colunas de um DataFrame (ex: vindas da planilha do usuário) viram texto no Parquet
+NUMERIC_FRAME_COLUMNS = ('Duração (seg)',)
+
+Batch = Union[RecordStore, pd.DataFrame, Iterable[Dict]]
+
+
+def _as_store(batch) -> RecordStore:
+    return batch if isinstance(batch, RecordStore) else RecordStore.from_records(list(batch))
+
+
+def _as_frame(batch) -> pd.DataFrame:
+    """Lote como DataFrame tipado (registros viram RecordStore antes)"""
+    if isinstance(batch, pd.DataFrame):
+        return batch
+    return _as_store(batch).to_dataframe()
+
+
+class Exporter(ABC):
+    """Base dos exportadores: write(lote) quantas vezes for preciso, depois close()"""
+
+    extension = ''
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+
+    def write(self, batch: Batch):
+        """
+        Grava um lote
+
+        Args:
+            batch: RecordStore, DataFrame ou lista de registros no formato de
+                SocialMediaScraper
+        """
+        if isinstance(batch, (RecordStore, pd.DataFrame)):
+            if len(batch) == 0:
+                return
+        else:
+            batch = list(batch)
+            if not batch:
+                return
+        self.rows += self._write(batch)
+
+    @abstractmethod
+    def close(self):
+        """Finaliza o arquivo"""
+
+    @abstractmethod
+    def _write(self, batch) -> int:
+        """Grava um lote não vazio e devolve o número de registros gravados"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CSVExporter(Exporter):
+    """CSV em UTF-8 com cabeçalho na primeira linha; ausentes ficam vazios"""
+
+    extension = '.csv'
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+
+    def _write(self, batch) -> int:
+        df = _as_frame(batch)
+        df.to_csv(self._file, header=self.rows == 0, index=False)
+        self._file.flush()
+        return len(df)
+
+    def close(self):
+        self._file.close()
+
+
+class JSONLExporter(Exporter):
+    """Um objeto JSON por linha; ausentes viram null"""
+
+    extension = '.jsonl'
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def _write(self, batch) -> int:
+        df = _as_frame(batch)
+        texto = df.to_json(orient='records', lines=True, force_ascii=False, date_format='iso')
+        self._file.write(texto if texto.endswith('\n') else texto + '\n')
+        self._file.flush()
+        return len(df)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetExporter(Exporter):
+    """
+    Parquet comprimido com o esquema tipado do RecordStore (requer pyarrow)
+
+    Cada lote vira um row group. O esquema é fixado pelo primeiro lote; os
+    seguintes são convertidos para ele. Em lotes DataFrame o esquema não depende
+    dos valores do lote: NUMERIC_FRAME_COLUMNS são float64 e o restante é texto
+    (uma coluna vazia no primeiro bloco e com texto depois não quebra o arquivo).
+    """
+
+    extension = '.parquet'
+
+    def __init__(self, path: str, compression: str = 'zstd'):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow não está instalado. Instale com: pip install pyarrow")
+
+        super().__init__(path)
+        self.compression = compression
+        self._pa = pa
+        self._pq = pq
+        self._writer = None
+
+    def _write(self, batch) -> int:
+        if isinstance(batch, pd.DataFrame):
+            table = self._frame_to_table(batch)
+        else:
+            table = _as_store(batch).to_arrow()
+
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema, compression=self.compression)
+        elif table.schema != self._writer.schema:
+            table = table.cast(self._writer.schema)
+
+        self._writer.write_table(table)
+        return table.num_rows
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    def _frame_to_table(self, df: pd.DataFrame):
+        """DataFrame como tabela Arrow com esquema explícito (ver a docstring da classe)"""
+        pa = self._pa
+        fields = []
+        arrays = []
+        for column in df.columns:
+            values = df[column]
+            if column in NUMERIC_FRAME_COLUMNS:
+                field = pa.field(str(column), pa.float64())
+                values = pd.to_numeric(values, errors='coerce').astype('float64')
+            else:
+                field = pa.field(str(column), pa.string())
+                # Inteiros lidos como float por causa de células vazias: 5.0 -> '5'
+                if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+                    values = values.astype('Int64')
+                values = values.astype(str).where(values.notna(), None)
+            fields.append(field)
+            arrays.append(pa.array(values, type=field.type, from_pandas=True))
+        return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+EXPORTERS = {exporter.extension: exporter for exporter in (CSVExporter, JSONLExporter, ParquetExporter)}
+
+
+def open_exporter(path: str, **options) -> Exporter:
+    """Exportador escolhido pela extensão do arquivo (.csv, .jsonl ou .parquet)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORTERS:
+        formatos = ', '.join(EXPORTERS)
+        raise ValueError(f"Formato de exportação não suportado: {extension or path} (use {formatos})")
+    return EXPORTERS[extension](path, **options)
+
+
+def write_records(records: Iterable[Dict], path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                  **options) -> int:
+    """
+    Grava registros de um iterável (ex: SocialMediaScraper.iter_all_platforms)
+    em lotes de batch_size, à medida que chegam
+
+    Returns:
+        Número de registros gravados
+    """
+    with open_exporter(path, **options) as exporter:
+        lote = []
+        for record in records:
+            lote.append(record)
+            if len(lote) == batch_size:
+                exporter.write(lote)
+                lote = []
+        exporter.write(lote)
+    return exporter.rows
@@ -0,0 +1,131 @@
+"""
+Cliente HTTP compartilhado pelas coletas
+Pool de conexões keep-alive, timeouts, retry com backoff exponencial e rate limiting por plataforma
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Status que valem uma nova tentativa (limite de taxa e erros do servidor)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Requisições por segundo padrão de cada plataforma
+DEFAULT_RATE_LIMITS = {
+    'youtube': 5.0,
+    'instagram': 1.0,
+    'tiktok': 1.0
+}
+
+
+class TokenBucket:
+    """Rate limiter token bucket: `rate` requisições por segundo, rajadas de até `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """Bloqueia até haver `tokens` disponíveis e os consome"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HttpClient:
+    """Sessão HTTP reaproveitada entre chamadas, com retry e rate limiting"""
+
+    def __init__(self, timeout=(5, 30), max_retries: int = 4, backoff_base: float = 0.5,
+                 backoff_max: float = 30.0, pool_size: int = 10,
+                 rate_limits: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            timeout: Timeout (conexão, leitura) em segundos
+            max_retries: Tentativas extras em 429/5xx e falhas de conexão
+            backoff_base: Espera base do backoff exponencial, em segundos
+            backoff_max: Espera máxima entre tentativas, em segundos
+            pool_size: Conexões keep-alive mantidas por host
+            rate_limits: Requisições por segundo por plataforma
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.rate_limiters = {}
+        for plataforma, rate in (rate_limits or DEFAULT_RATE_LIMITS).items():
+            self.configure_rate_limit(plataforma, rate)
+
+    def configure_rate_limit(self, plataforma: str, rate: float, capacity: Optional[float] = None):
+        """Define o limite de requisições por segundo de uma plataforma"""
+        self.rate_limiters[plataforma] = TokenBucket(rate, capacity)
+
+    def wait_turn(self, plataforma: str):
+        """Aguarda o rate limiter da plataforma (não faz nada se não houver limite)"""
+        limiter = self.rate_limiters.get(plataforma)
+        if limiter:
+            limiter.acquire()
+
+    def get(self, url: str, params: Optional[Dict] = None, plataforma: Optional[str] = None,
+            **kwargs) -> requests.Response:
+        """
+        GET com rate limiting, timeout e retry com backoff exponencial + jitter
+
+        Args:
+            url: Endereço da requisição
+            params: Parâmetros de query string
+            plataforma: Plataforma cujo rate limiter deve ser respeitado
+
+        Returns:
+            Resposta final (a última, se todas as tentativas falharem com 429/5xx)
+        """
+        kwargs.setdefault('timeout', self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            if plataforma:
+                self.wait_turn(plataforma)
+
+            try:
+                response = self.session.get(url, params=params, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUS or attempt == self.max_retries:
+                return response
+
+            time.sleep(self._retry_delay(response, attempt))
+
+    def _backoff(self, attempt: int) -> float:
+        """Backoff exponencial com full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Respeita o header Retry-After quando o servidor o envia"""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return min(self.backoff_max, float(retry_after))
+        return self._backoff(attempt)
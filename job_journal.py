@@ -0,0 +1,116 @@
+"""
+Diário de jobs de extração (SQLite)
+Cada linha concluída de uma planilha é gravada assim que termina, para que um job
+interrompido (queda da sessão, reinício do servidor) seja retomado de onde parou
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class JobJournal:
+    """Registro somente de inclusão dos resultados por linha de cada job"""
+
+    def __init__(self, path: str = 'jobs.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL: cada gravação é um append barato e leituras não bloqueiam o job
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                total INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                finished_at REAL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_rows (
+                job_id TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                resultado TEXT NOT NULL,
+                PRIMARY KEY (job_id, row)
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def make_job_id(conteudo: bytes, **config) -> str:
+        """
+        Identificador do job: hash do arquivo de entrada + configurações
+
+        Ex: make_job_id(arquivo.getvalue(), coluna='url', tempo_minimo=60)
+        """
+        digest = hashlib.sha256(conteudo)
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def start(self, job_id: str, total: int):
+        """Registra o job, se ainda não existir (retomar não apaga o que já foi feito)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_id, total, created_at) VALUES (?, ?, ?)",
+                (job_id, total, time.time())
+            )
+            self._conn.commit()
+
+    def record(self, job_id: str, rows: List[int], resultado: Dict):
+        """
+        Grava o resultado de extrair_duracao_url para as linhas (posições) informadas
+
+        Uma linha gravada de novo (ex: erro extraído outra vez) fica com o resultado novo.
+        """
+        body = json.dumps(resultado, ensure_ascii=False)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO job_rows (job_id, row, resultado) VALUES (?, ?, ?)",
+                [(job_id, row, body) for row in rows]
+            )
+            self._conn.commit()
+
+    def completed(self, job_id: str) -> Dict[int, Dict]:
+        """Resultados já gravados, por posição da linha"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT row, resultado FROM job_rows WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        return {row: json.loads(resultado) for row, resultado in rows}
+
+    def finish(self, job_id: str):
+        """Marca o job como concluído"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET finished_at = ? WHERE job_id = ? AND finished_at IS NULL",
+                (time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """Total de linhas, linhas concluídas e se o job terminou (None se desconhecido)"""
+        with self._lock:
+            job = self._conn.execute(
+                "SELECT total, finished_at FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            concluidas = self._conn.execute(
+                "SELECT COUNT(*) FROM job_rows WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+        return {'total': job[0], 'concluidas': concluidas, 'finalizado': job[1] is not None}
+
+    def discard(self, job_id: str):
+        """Apaga o job e seus resultados (o próximo processamento começa do zero)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM job_rows WHERE job_id = ?", (job_id,))
+            self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            self._conn.commit()
+
+    def close(self):
+        """Fecha a conexão com o arquivo SQLite"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,165 @@
+"""
+Execução de jobs em segundo plano
+Pool de workers do próprio processo, registro de jobs e consulta de progresso/status,
+para que extrações longas não dependam da execução do script do Streamlit
+"""
+
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+# Jobs simultâneos (cada um pode ter seu próprio pool de extração)
+DEFAULT_JOB_WORKERS = 2
+
+# Tempo (segundos) que um job concluído fica disponível para reaproveitamento
+JOB_TTL = 3600
+
+# Estados de um job
+NA_FILA = 'na_fila'
+EXECUTANDO = 'executando'
+CONCLUIDO = 'concluido'
+ERRO = 'erro'
+
+
+class Job:
+    """Um job submetido ao JobRunner, com progresso e resultado"""
+
+    def __init__(self, job_id: str, descricao: str = ''):
+        self.job_id = job_id
+        self.descricao = descricao
+        self.status = NA_FILA
+        self.concluidas = 0
+        self.total = 0
+        self.mensagem = ''
+        self.resultado = None
+        self.erro = None
+        self.criado_em = time.time()
+        self.finalizado_em = None
+
+    @property
+    def ativo(self) -> bool:
+        return self.status in (NA_FILA, EXECUTANDO)
+
+    def progress(self, concluidas: int, total: int, mensagem: str = ''):
+        """Atualiza o progresso; compatível com on_progress(concluidas, total, url)"""
+        self.concluidas = concluidas
+        self.total = total
+        self.mensagem = mensagem
+
+    def snapshot(self) -> Dict:
+        """Estado atual do job como dicionário"""
+        return {
+            'job_id': self.job_id,
+            'descricao': self.descricao,
+            'status': self.status,
+            'concluidas': self.concluidas,
+            'total': self.total,
+            'mensagem': self.mensagem,
+            'erro': self.erro,
+            'criado_em': self.criado_em,
+            'finalizado_em': self.finalizado_em
+        }
+
+
+class JobRunner:
+    """
+    Executa jobs em threads de fundo e guarda o registro deles
+
+    Jobs com o mesmo job_id não são executados duas vezes: enquanto um job está na
+    fila, em execução ou concluído há menos de `ttl` segundos, submeter o mesmo
+    job_id devolve o job existente. Jobs com erro são executados de novo, assim
+    como os concluídos quando submit recebe reutilizar_concluido=False.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_JOB_WORKERS, ttl: int = JOB_TTL):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='job')
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_job_id(**config) -> str:
+        """Identificador determinístico a partir das configurações do job"""
+        raw = json.dumps(config, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def submit(self, job_id: str, fn: Callable, *args, descricao: str = '',
+               reutilizar_concluido: bool = True, **kwargs) -> Job:
+        """
+        Agenda fn(job, *args, **kwargs); o valor retornado vira job.resultado
+
+        Com reutilizar_concluido=False, só um job ainda na fila ou em execução é
+        reaproveitado (ex: buscas, cujo resultado muda com o tempo).
+
+        fn roda fora da thread do Streamlit: não deve chamar st.*, apenas
+        job.progress() para informar o andamento.
+        """
+        with self._lock:
+            self._purge()
+            existente = self._jobs.get(job_id)
+            reutilizavel = existente is not None and (
+                existente.ativo or (reutilizar_concluido and existente.status != ERRO)
+            )
+            if reutilizavel:
+                return existente
+
+            job = Job(job_id, descricao)
+            self._jobs[job_id] = job
+
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Job registrado com esse id, ou None"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """Snapshot do job (ver Job.snapshot), ou None se desconhecido"""
+        job = self.get(job_id)
+        return job.snapshot() if job else None
+
+    def result(self, job_id: str):
+        """Resultado de um job concluído (None enquanto não terminar)"""
+        job = self.get(job_id)
+        return job.resultado if job and job.status == CONCLUIDO else None
+
+    def list_jobs(self) -> List[Dict]:
+        """Snapshots de todos os jobs registrados, do mais recente ao mais antigo"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job.snapshot() for job in sorted(jobs, key=lambda job: job.criado_em, reverse=True)]
+
+    def shutdown(self, wait: bool = True):
+        """Encerra o pool de workers"""
+        self._executor.shutdown(wait=wait)
+
+    # Métodos auxiliares
+
+    @staticmethod
+    def _run(job: Job, fn: Callable, args, kwargs):
+        """Executa o job registrando estado, resultado e erro"""
+        job.status = EXECUTANDO
+        try:
+            resultado = fn(job, *args, **kwargs)
+        except Exception as e:
+            job.erro = str(e)
+            job.finalizado_em = time.time()
+            job.status = ERRO
+        else:
+            job.resultado = resultado
+            job.finalizado_em = time.time()
+            job.status = CONCLUIDO
+
+    def _purge(self):
+        """Remove jobs finalizados há mais de ttl segundos (chamar com o lock)"""
+        limite = time.time() - self.ttl
+        expirados = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finalizado_em is not None and job.finalizado_em < limite
+        ]
+        for job_id in expirados:
+            del self._jobs[job_id]
@@ -0,0 +1,183 @@
+"""
+Controle de quota diária da YouTube Data API
+Contabiliza unidades gastas por API key e por dia (persistido em SQLite) e planeja filas de hashtags
+"""
+
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+try:
+    from zoneinfo import ZoneInfo
+    # A quota do YouTube é zerada à meia-noite do horário do Pacífico
+    QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+except Exception:
+    QUOTA_TIMEZONE = None
+
+# Custo em unidades de cada endpoint
+QUOTA_COSTS = {
+    'search': 100,
+    'videos': 1
+}
+
+DAILY_QUOTA = 10000
+
+# Itens por página de search.list / IDs por chamada de videos.list
+PAGE_SIZE = 50
+
+# Custo de uma página de resultados: search.list + videos.list dos seus IDs
+PAGE_COST = QUOTA_COSTS['search'] + QUOTA_COSTS['videos']
+
+
+class QuotaExceededError(Exception):
+    """Nenhuma API key tem quota suficiente para a operação"""
+
+
+def plan_jobs(jobs: List[Tuple[str, int]], pages: int) -> Tuple[List[Tuple[str, int]], List[str]]:
+    """
+    Distribui o orçamento entre hashtags para maximizar a cobertura
+
+    Cada hashtag recebe primeiro uma página de resultados; as páginas extras são
+    distribuídas em rodízio enquanto houver orçamento.
+
+    Args:
+        jobs: Lista de (hashtag, max_results desejado)
+        pages: Páginas que a quota restante consegue pagar
+            (ver QuotaTracker.pages_remaining)
+
+    Returns:
+        (jobs planejados com o max_results ajustado, hashtags adiadas)
+    """
+    allotted = {hashtag: 0 for hashtag, _ in jobs}
+
+    pending = True
+    while pending:
+        pending = False
+        for hashtag, max_results in jobs:
+            if allotted[hashtag] >= max_results:
+                continue
+            if pages <= 0:
+                break
+            allotted[hashtag] = min(max_results, allotted[hashtag] + PAGE_SIZE)
+            pages -= 1
+            pending = True
+
+    planned = [(hashtag, allotted[hashtag]) for hashtag, _ in jobs if allotted[hashtag] > 0]
+    deferred = [hashtag for hashtag, _ in jobs if allotted[hashtag] == 0]
+    return planned, deferred
+
+
+class QuotaTracker:
+    """Contabilidade de quota por API key e por dia, compartilhada entre processos"""
+
+    def __init__(self, path: str = 'youtube_quota.sqlite', daily_budget: int = DAILY_QUOTA):
+        """
+        Args:
+            path: Arquivo SQLite com o consumo
+            daily_budget: Unidades que cada API key pode gastar por dia
+        """
+        self.path = path
+        self.daily_budget = daily_budget
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS usage (
+                key_id TEXT NOT NULL,
+                day TEXT NOT NULL,
+                units INTEGER NOT NULL,
+                PRIMARY KEY (key_id, day)
+            )
+        """)
+
+    @staticmethod
+    def today() -> str:
+        """Dia de quota atual (horário do Pacífico, quando disponível)"""
+        return datetime.now(QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+
+    @staticmethod
+    def _key_id(api_key: str) -> str:
+        """Identificador da API key gravado em disco (a chave em si não é salva)"""
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+    def spent(self, api_key: str) -> int:
+        """Unidades já gastas hoje com a API key"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT units FROM usage WHERE key_id = ? AND day = ?",
+                (self._key_id(api_key), self.today())
+            ).fetchone()
+        return row[0] if row else 0
+
+    def remaining(self, api_key: str) -> int:
+        """Unidades ainda disponíveis hoje para a API key"""
+        return max(0, self.daily_budget - self.spent(api_key))
+
+    def pages_remaining(self, api_keys: List[str]) -> int:
+        """
+        Páginas de resultados que as API keys ainda pagam hoje
+
+        Cada search.list é debitado de uma única chave, então os saldos não são
+        somados em unidades: uma chave com 60 unidades não paga nenhuma página.
+        """
+        return sum(self.remaining(api_key) // PAGE_COST for api_key in api_keys)
+
+    def reserve(self, api_keys: List[str], units: int) -> str:
+        """
+        Debita `units` da primeira API key com saldo suficiente
+
+        Args:
+            api_keys: API keys em ordem de preferência (rodízio)
+            units: Custo da operação
+
+        Returns:
+            A API key debitada
+
+        Raises:
+            QuotaExceededError: Se nenhuma chave tiver saldo
+        """
+        day = self.today()
+
+        with self._lock:
+            # BEGIN IMMEDIATE trava o arquivo, evitando gasto duplo entre processos
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for api_key in api_keys:
+                    key_id = self._key_id(api_key)
+                    row = self._conn.execute(
+                        "SELECT units FROM usage WHERE key_id = ? AND day = ?", (key_id, day)
+                    ).fetchone()
+                    spent = row[0] if row else 0
+
+                    if spent + units <= self.daily_budget:
+                        self._conn.execute(
+                            "INSERT INTO usage (key_id, day, units) VALUES (?, ?, ?) "
+                            "ON CONFLICT (key_id, day) DO UPDATE SET units = units + excluded.units",
+                            (key_id, day, units)
+                        )
+                        self._conn.execute("COMMIT")
+                        return api_key
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self._conn.execute("ROLLBACK")
+
+        raise QuotaExceededError(f"Quota diária esgotada ({units} unidades necessárias)")
+
+    def mark_exhausted(self, api_key: str):
+        """Marca a API key como sem saldo hoje (ex: a API respondeu quotaExceeded)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO usage (key_id, day, units) VALUES (?, ?, ?) "
+                "ON CONFLICT (key_id, day) DO UPDATE SET units = excluded.units",
+                (self._key_id(api_key), self.today(), self.daily_budget)
+            )
+
+    def report(self, api_keys: List[str]) -> Dict[str, Dict]:
+        """Consumo de hoje por API key (identificada pelos últimos 4 caracteres)"""
+        return {
+            f"...{api_key[-4:]}": {'gasto': self.spent(api_key), 'restante': self.remaining(api_key)}
+            for api_key in api_keys
+        }
@@ -0,0 +1,292 @@
+"""
+Armazenamento colunar e tipado dos registros coletados
+Substitui a lista de dicionários: contadores int64, salvamentos como inteiro anulável
+e plataforma/hashtag/perfil como categorias
+"""
+
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Linhas convertidas por vez em iter_rows
+ROW_BATCH_SIZE = 10000
+
+# Colunas na ordem dos registros de SocialMediaScraper
+COLUMNS = (
+    'plataforma', 'hashtag', 'perfil', 'titulo', 'video_id',
+    'likes', 'comentarios', 'visualizacoes', 'salvamentos',
+    'duracao_segundos', 'duracao_formatada', 'data_publicacao', 'url'
+)
+
+CATEGORY_COLUMNS = ('plataforma', 'hashtag', 'perfil')
+INT_COLUMNS = ('likes', 'comentarios', 'visualizacoes', 'duracao_segundos')
+NULLABLE_INT_COLUMNS = ('salvamentos',)  # Ex: YouTube não informa salvamentos
+STRING_COLUMNS = ('titulo', 'video_id', 'duracao_formatada', 'data_publicacao', 'url')
+
+
+def _to_nullable_int(value):
+    """Converte para int, ou None quando o valor não existe (ex: 'N/A')"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RecordStore:
+    """
+    Registros em colunas tipadas, com append barato e conversão sem cópia
+
+    Os contadores ficam em buffers numpy que dobram de tamanho quando enchem;
+    as categorias são guardadas como códigos int32. Iterar ou indexar devolve
+    dicionários no mesmo formato dos registros originais.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self._capacity = max(1, capacity)
+        self._ints = {
+            column: np.zeros(self._capacity, dtype=np.int64)
+            for column in INT_COLUMNS + NULLABLE_INT_COLUMNS
+        }
+        # True = valor ausente
+        self._masks = {column: np.zeros(self._capacity, dtype=bool) for column in NULLABLE_INT_COLUMNS}
+        self._codes = {column: np.zeros(self._capacity, dtype=np.int32) for column in CATEGORY_COLUMNS}
+        self._categories = {column: [] for column in CATEGORY_COLUMNS}
+        self._category_index = {column: {} for column in CATEGORY_COLUMNS}
+        self._strings = {column: [] for column in STRING_COLUMNS}
+        # Incrementada a cada alteração (permite memoizar cálculos sobre os dados)
+        self.version = 0
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> 'RecordStore':
+        """Cria um store a partir de dicionários (lista ou iterador)"""
+        store = cls(capacity=len(records) if isinstance(records, list) else 1024)
+        store.extend(records)
+        return store
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(self._size):
+            yield self._row(i)
+
+    def __getitem__(self, i):
+        # Fatias devolvem lista de dicionários, como quando os dados eram uma lista
+        if isinstance(i, slice):
+            return [self._row(j) for j in range(*i.indices(self._size))]
+        return self._row(self._index(i))
+
+    def __repr__(self) -> str:
+        return f"RecordStore({self._size} registros)"
+
+    def append(self, record: Dict):
+        """Adiciona um registro (dicionário no formato de SocialMediaScraper)"""
+        if self._size == self._capacity:
+            self._grow(self._capacity * 2)
+
+        for column in STRING_COLUMNS:
+            self._strings[column].append(record.get(column))
+        self._write(self._size, record)
+        self._size += 1
+        self.version += 1
+
+    def extend(self, records: Iterable[Dict]):
+        """Adiciona vários registros; aceita iteradores, consumidos sob demanda"""
+        for record in records:
+            self.append(record)
+
+    def set_row(self, i: int, record: Dict):
+        """Substitui o registro da posição i"""
+        i = self._index(i)
+        for column in STRING_COLUMNS:
+            self._strings[column][i] = record.get(column)
+        self._write(i, record)
+        self.version += 1
+
+    def update(self, i: int, **fields):
+        """Altera alguns campos do registro da posição i"""
+        record = self[i]
+        record.update(fields)
+        self.set_row(i, record)
+
+    def column(self, name: str):
+        """
+        Valores de uma coluna
+
+        Returns:
+            Array numpy (view, sem cópia) para contadores; lista para as demais
+        """
+        if name in INT_COLUMNS:
+            return self._ints[name][:self._size]
+        if name in CATEGORY_COLUMNS:
+            categories = self._categories[name]
+            return [categories[code] if code >= 0 else None for code in self._codes[name][:self._size].tolist()]
+        if name in NULLABLE_INT_COLUMNS:
+            return self._nullable_array(name)
+        return self._strings[name][:self._size]
+
+    def category_codes(self, name: str):
+        """
+        Códigos int32 (view, sem cópia) e lista de categorias de uma coluna categórica
+
+        categories[codes[i]] é o valor do registro i; código -1 indica valor ausente.
+        """
+        if name not in CATEGORY_COLUMNS:
+            raise KeyError(f"'{name}' não é uma coluna categórica")
+        return self._codes[name][:self._size], list(self._categories[name])
+
+    def iter_rows(self, positions=None, batch_size: int = ROW_BATCH_SIZE) -> Iterator[Tuple]:
+        """
+        Registros como tuplas na ordem de COLUMNS, montadas bloco a bloco a partir
+        dos buffers (só um bloco de valores Python existe por vez)
+
+        Args:
+            positions: Posições a ler, em ordem (padrão: todas); salvamentos
+                ausentes vêm como None
+            batch_size: Registros convertidos por bloco
+        """
+        if positions is None:
+            positions = np.arange(self._size)
+        positions = np.asarray(positions, dtype=np.int64)
+
+        for start in range(0, len(positions), batch_size):
+            block = positions[start:start + batch_size]
+            columns = []
+            for column in COLUMNS:
+                if column in INT_COLUMNS:
+                    values = self._ints[column][block].tolist()
+                elif column in NULLABLE_INT_COLUMNS:
+                    values = [
+                        None if missing else value
+                        for value, missing in zip(self._ints[column][block].tolist(), self._masks[column][block])
+                    ]
+                elif column in CATEGORY_COLUMNS:
+                    categories = self._categories[column]
+                    values = [categories[code] if code >= 0 else None for code in self._codes[column][block].tolist()]
+                else:
+                    strings = self._strings[column]
+                    values = [strings[i] for i in block.tolist()]
+                columns.append(values)
+            yield from zip(*columns)
+
+    def to_records(self) -> List[Dict]:
+        """Converte de volta para lista de dicionários"""
+        return list(self)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        DataFrame tipado: int64, Int64 (anulável) e category
+
+        Contadores e máscara são views dos buffers internos (sem cópia); os códigos
+        das categorias são apenas remapeados para a ordem alfabética e as colunas
+        de texto são materializadas. Como a memória é compartilhada, use .copy()
+        no DataFrame se o store for alterado depois.
+        """
+        n = self._size
+        columns = {}
+        for column in COLUMNS:
+            if column in INT_COLUMNS:
+                columns[column] = self._ints[column][:n]
+            elif column in NULLABLE_INT_COLUMNS:
+                columns[column] = self._nullable_array(column)
+            elif column in CATEGORY_COLUMNS:
+                # Categorias em ordem alfabética, como nos groupby sobre texto
+                columns[column] = pd.Categorical.from_codes(
+                    self._codes[column][:n],
+                    categories=pd.Index(self._categories[column], dtype=object)
+                ).reorder_categories(sorted(self._categories[column]))
+            else:
+                columns[column] = np.array(self._strings[column][:n], dtype=object)
+        return pd.DataFrame(columns, copy=False)
+
+    def to_arrow(self):
+        """
+        Tabela Apache Arrow com o mesmo esquema tipado (requer pyarrow)
+
+        Contadores e códigos das categorias são passados ao Arrow sem cópia.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow não está instalado. Instale com: pip install pyarrow")
+
+        n = self._size
+        arrays = []
+        for column in COLUMNS:
+            if column in INT_COLUMNS:
+                arrays.append(pa.array(self._ints[column][:n]))
+            elif column in NULLABLE_INT_COLUMNS:
+                arrays.append(pa.array(self._ints[column][:n], mask=self._masks[column][:n]))
+            elif column in CATEGORY_COLUMNS:
+                codes = self._codes[column][:n]
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    pa.array(codes, mask=codes < 0),
+                    pa.array(self._categories[column], type=pa.string())
+                ))
+            else:
+                arrays.append(pa.array(self._strings[column][:n], type=pa.string()))
+        return pa.Table.from_arrays(arrays, names=list(COLUMNS))
+
+    # Métodos auxiliares
+
+    def _index(self, i: int) -> int:
+        """Normaliza índices negativos e valida o intervalo"""
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("índice fora do intervalo do RecordStore")
+        return i
+
+    def _grow(self, capacity: int):
+        """Aumenta os buffers numpy para a nova capacidade"""
+        for buffers in (self._ints, self._masks, self._codes):
+            for column, buffer in buffers.items():
+                grown = np.zeros(capacity, dtype=buffer.dtype)
+                grown[:self._size] = buffer[:self._size]
+                buffers[column] = grown
+        self._capacity = capacity
+
+    def _encode(self, column: str, value) -> int:
+        """Código da categoria, registrando-a se for nova"""
+        index = self._category_index[column]
+        code = index.get(value)
+        if code is None:
+            if value is None or value != value:
+                # Ausente (None/NaN): código -1, como nos Categorical do pandas
+                return -1
+            code = len(self._categories[column])
+            self._categories[column].append(value)
+            index[value] = code
+        return code
+
+    def _write(self, i: int, record: Dict):
+        """Grava as colunas numéricas e categóricas do registro na posição i"""
+        for column in INT_COLUMNS:
+            self._ints[column][i] = int(record.get(column) or 0)
+        for column in NULLABLE_INT_COLUMNS:
+            value = _to_nullable_int(record.get(column))
+            self._masks[column][i] = value is None
+            self._ints[column][i] = value or 0
+        for column in CATEGORY_COLUMNS:
+            self._codes[column][i] = self._encode(column, record.get(column))
+
+    def _nullable_array(self, column: str) -> pd.arrays.IntegerArray:
+        """Coluna anulável como IntegerArray do pandas (views dos buffers)"""
+        return pd.arrays.IntegerArray(self._ints[column][:self._size], self._masks[column][:self._size])
+
+    def _row(self, i: int) -> Dict:
+        """Registro da posição i como dicionário"""
+        record = {}
+        for column in COLUMNS:
+            if column in INT_COLUMNS:
+                record[column] = int(self._ints[column][i])
+            elif column in NULLABLE_INT_COLUMNS:
+                record[column] = None if self._masks[column][i] else int(self._ints[column][i])
+            elif column in CATEGORY_COLUMNS:
+                code = self._codes[column][i]
+                record[column] = self._categories[column][code] if code >= 0 else None
+            else:
+                record[column] = self._strings[column][i]
+        return record
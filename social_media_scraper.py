@@ -4,23 +4,86 @@ Coleta dados de Instagram, TikTok e YouTube baseado em hashtags
 """
 
 import pandas as pd
-import json
-import time
+import io
 from datetime import datetime
-from typing import List, Dict
-import requests
+from typing import List, Dict, Iterator
+import queue
+import threading
 from collections import defaultdict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from http_client import HttpClient
+from cache import ResponseCache
+from quota import QuotaTracker, QuotaExceededError, QUOTA_COSTS, DAILY_QUOTA, plan_jobs
+from watermarks import WatermarkStore
+from record_store import RecordStore, COLUMNS
+from aggregations import Aggregates, aggregate
+from exporters import open_exporter
+
+# Ordem fixa das plataformas (define a ordem dos resultados combinados)
+PLATAFORMAS = ('youtube', 'instagram', 'tiktok')
+
+# Máximo de itens por página em search.list e de IDs por chamada em videos.list
+YOUTUBE_PAGE_SIZE = 50
+
+YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3"
+
+# Largura das colunas da aba TODOS OS DADOS (nas abas por plataforma, sem a primeira)
+EXCEL_COLUMN_WIDTHS = (12, 15, 20, 40, 15, 12, 12, 12, 12, 15, 16, 12, 50)
+
+# Linhas por aba do Excel, incluindo o cabeçalho; abas maiores são divididas
+EXCEL_MAX_ROWS = 1048576
+
+TOP_PERFIS_HEADERS = ('Plataforma', 'Perfil', 'Total Likes', 'Total Comentários', 'Total Posts', 'Engajamento Total')
 
 class SocialMediaScraper:
     """Classe principal para coletar dados de redes sociais"""
     
     def __init__(self):
-        self.data = []
+        self._data = RecordStore()
         self.api_keys = {
             'youtube': None,  # Adicionar sua API key do YouTube
             'instagram': None,  # Adicionar token de acesso do Instagram
             'tiktok': None  # Adicionar API key do TikTok
         }
+        # Máximo de buscas simultâneas por plataforma
+        self.platform_limits = {
+            'youtube': 2,
+            'instagram': 1,
+            'tiktok': 1
+        }
+        self._platform_semaphores = {
+            plataforma: threading.BoundedSemaphore(limite)
+            for plataforma, limite in self.platform_limits.items()
+        }
+        # Erros da última coleta, por plataforma
+        self.errors = {}
+        # Vídeos de cada hashtag na última coleta com search_many
+        self.hashtag_map = {}
+        # Histórico de estatísticas gerado por refresh_statistics
+        self.snapshots = []
+        # Sessão HTTP compartilhada (keep-alive, retry e rate limiting por plataforma)
+        self.http = HttpClient()
+        # Cache opcional de respostas da API do YouTube (ver configure_cache)
+        self.cache = None
+        # Controle opcional de quota diária do YouTube (ver configure_quota)
+        self.quota = None
+        self.youtube_keys = []
+        self.deferred_jobs = []
+        # Marcas d'água da coleta incremental (ver configure_watermarks)
+        self.watermarks = None
+        # Última agregação calculada: (store, versão, Aggregates)
+        self._aggregates = None
+    
+    @property
+    def data(self) -> RecordStore:
+        """Registros coletados, em armazenamento colunar tipado"""
+        return self._data
+    
+    @data.setter
+    def data(self, records):
+        # Aceita RecordStore ou qualquer iterável de dicionários
+        self._data = records if isinstance(records, RecordStore) else RecordStore.from_records(records)
     
     def configure_apis(self, youtube_key=None, instagram_token=None, tiktok_key=None):
         """Configura as chaves de API das plataformas"""
@@ -31,88 +94,314 @@ class SocialMediaScraper:
         if tiktok_key:
             self.api_keys['tiktok'] = tiktok_key
     
-    def search_youtube(self, hashtag: str, max_results: int = 50) -> List[Dict]:
+    def configure_limits(self, youtube=None, instagram=None, tiktok=None):
+        """Configura o máximo de buscas simultâneas em cada plataforma"""
+        for plataforma, limite in (('youtube', youtube), ('instagram', instagram), ('tiktok', tiktok)):
+            if limite:
+                self.platform_limits[plataforma] = limite
+                self._platform_semaphores[plataforma] = threading.BoundedSemaphore(limite)
+    
+    def configure_rate_limits(self, youtube=None, instagram=None, tiktok=None):
+        """Configura o máximo de requisições por segundo em cada plataforma"""
+        for plataforma, rate in (('youtube', youtube), ('instagram', instagram), ('tiktok', tiktok)):
+            if rate:
+                self.http.configure_rate_limit(plataforma, rate)
+    
+    def configure_cache(self, path: str = 'youtube_cache.sqlite', ttls: Dict = None,
+                        max_entries: int = 10000):
+        """
+        Ativa o cache em disco das respostas da API do YouTube
+        
+        Args:
+            path: Arquivo SQLite do cache
+            ttls: Validade em segundos por endpoint (ex: {'search': 21600, 'videos': 3600})
+            max_entries: Máximo de respostas guardadas (descarta as menos usadas)
+        """
+        self.cache = ResponseCache(path, ttls=ttls, max_entries=max_entries)
+        return self.cache
+    
+    def configure_quota(self, path: str = 'youtube_quota.sqlite', daily_budget: int = DAILY_QUOTA,
+                        youtube_keys: List[str] = None):
+        """
+        Ativa a contabilidade de quota do YouTube
+        
+        Args:
+            path: Arquivo SQLite com o consumo (compartilhado entre processos)
+            daily_budget: Unidades por API key por dia
+            youtube_keys: API keys usadas em rodízio quando uma esgota
+        """
+        self.quota = QuotaTracker(path, daily_budget=daily_budget)
+        if youtube_keys:
+            self.youtube_keys = list(youtube_keys)
+            if not self.api_keys['youtube']:
+                self.api_keys['youtube'] = self.youtube_keys[0]
+        return self.quota
+    
+    def configure_watermarks(self, path: str = 'watermarks.sqlite'):
+        """Define o arquivo SQLite das marcas d'água usadas na coleta incremental"""
+        self.watermarks = WatermarkStore(path)
+        return self.watermarks
+    
+    def search_youtube(self, hashtag: str, max_results: int = 50,
+                       incremental: bool = False) -> List[Dict]:
         """
         Busca vídeos no YouTube por hashtag usando YouTube Data API v3
         
         Args:
             hashtag: Hashtag para buscar (sem #)
             max_results: Número máximo de resultados
+            incremental: Se True, busca apenas vídeos publicados depois da
+                marca d'água da hashtag (order=date + publishedAfter)
             
         Returns:
             Lista de dicionários com dados dos vídeos
         """
+        return list(self.iter_youtube(hashtag, max_results, incremental))
+    
+    def iter_youtube(self, hashtag: str, max_results: int = 50,
+                     incremental: bool = False) -> Iterator[Dict]:
+        """
+        Versão em streaming de search_youtube: gera cada vídeo assim que a sua
+        página de busca é enriquecida, sem esperar as páginas seguintes
+        
+        Args:
+            hashtag: Hashtag para buscar (sem #)
+            max_results: Número máximo de resultados
+            incremental: Se True, busca apenas vídeos publicados depois da
+                marca d'água da hashtag (order=date + publishedAfter). A primeira
+                coleta grava a marca d'água; se uma coleta posterior parar em
+                max_results, a seguinte continua do vídeo mais antigo coletado
+                (publishedBefore) até fechar o intervalo
+            
+        Yields:
+            Dicionários com dados dos vídeos
+        
+        Raises:
+            Exception: Se a busca falhar com API Key configurada (dados de exemplo
+                só são usados quando não há chave)
+        """
         print(f"🔍 Buscando vídeos no YouTube com hashtag: #{hashtag}")
         
         if not self.api_keys['youtube']:
             print("⚠️  API Key do YouTube não configurada. Retornando dados de exemplo.")
-            return self._get_youtube_sample_data(hashtag)
+            yield from self._get_youtube_sample_data(hashtag)
+            return
+        
+        count = 0
+        newest = None
+        oldest = None
+        paginacao = {}
         
         try:
-            # Endpoint da API do YouTube
-            search_url = "https://www.googleapis.com/youtube/v3/search"
-            video_url = "https://www.googleapis.com/youtube/v3/videos"
+            watermark = None
+            resume = None
+            published_after = None
+            if incremental:
+                if self.watermarks is None:
+                    self.configure_watermarks()
+                watermark = self.watermarks.get('youtube', hashtag)
+                if watermark:
+                    published_after = WatermarkStore.next_after(watermark)
+                    resume = self.watermarks.resume_point('youtube', hashtag)
+                    if resume:
+                        print(f"   ↪ Coleta incremental: retomando vídeos publicados entre {watermark} e {resume[0]}")
+                    else:
+                        print(f"   ↪ Coleta incremental: vídeos publicados após {watermark}")
             
-            results = []
+            pages = self._youtube_search_pages(
+                hashtag, max_results,
+                order='date' if incremental else None,
+                published_after=published_after,
+                published_before=WatermarkStore.last_before(resume[0]) if resume else None,
+                state=paginacao
+            )
+            
+            for video_ids in pages:
+                # Obter estatísticas detalhadas da página
+                for item in self._youtube_fetch_videos(video_ids).values():
+                    video_info = self._youtube_video_info(item, hashtag)
+                    if newest is None or video_info['data_publicacao'] > newest:
+                        newest = video_info['data_publicacao']
+                    if oldest is None or video_info['data_publicacao'] < oldest:
+                        oldest = video_info['data_publicacao']
+                    count += 1
+                    yield video_info
+            
+            if incremental:
+                self._update_youtube_watermark(hashtag, watermark, resume, newest, oldest,
+                                               paginacao.get('esgotada', False))
+            
+            if count == 0:
+                print("⚠️  Nenhum vídeo novo encontrado" if published_after else "⚠️  Nenhum vídeo encontrado")
+                return
             
-            # Buscar vídeos
+            print(f"✅ {count} vídeos coletados do YouTube")
+            
+        except QuotaExceededError as e:
+            # Sem quota: fica com o que já foi coletado, sem misturar dados de exemplo
+            print(f"⛔ {str(e)}. Retornando {count} vídeos já coletados.")
+            
+        except Exception as e:
+            # Com API Key configurada, a falha é propagada (quem chama registra em
+            # self.errors): dados de exemplo nunca se misturam aos reais
+            print(f"❌ Erro ao buscar no YouTube: {str(e)}")
+            raise
+    
+    def _update_youtube_watermark(self, hashtag: str, watermark: str, resume, newest: str,
+                                  oldest: str, esgotada: bool):
+        """
+        Atualiza a marca d'água depois de uma coleta incremental completa
+        
+        Com order=date, parar em max_results deixa de fora os vídeos mais antigos
+        que a marca d'água anterior ainda não cobria; em vez de avançar por cima
+        deles, grava o vídeo mais antigo coletado como ponto de retomada.
+        """
+        if not watermark:
+            # Primeira coleta: o vídeo mais recente vira a linha de base
+            if newest:
+                self.watermarks.advance('youtube', hashtag, newest)
+            return
+        
+        # Mais recente já coletado entre todas as partes do intervalo
+        pending = max(filter(None, [newest, resume[1] if resume else None]), default=None)
+        
+        if esgotada:
+            if pending:
+                self.watermarks.advance('youtube', hashtag, pending)
+        elif oldest:
+            self.watermarks.set_resume_point('youtube', hashtag, oldest, pending)
+            print(f"   ↪ Limite de resultados atingido; a próxima coleta continua a partir de {oldest}")
+    
+    def _youtube_search_pages(self, hashtag: str, max_results: int, order: str = None,
+                              published_after: str = None, published_before: str = None,
+                              state: Dict = None) -> Iterator[List[str]]:
+        """
+        Pagina search.list (seguindo nextPageToken) até reunir max_results IDs
+        
+        Args:
+            state: Se informado, recebe state['esgotada'] = True quando a busca
+                termina por falta de páginas (e não por atingir max_results)
+        
+        Yields:
+            IDs ainda não vistos de cada página, na ordem da busca
+        
+        Raises:
+            RuntimeError: Se alguma página falhar (a busca ficaria incompleta)
+        """
+        seen = set()
+        page_token = None
+        
+        while len(seen) < max_results:
             search_params = {
                 'part': 'snippet',
                 'q': f'#{hashtag}',
                 'type': 'video',
-                'maxResults': min(max_results, 50),
+                'maxResults': min(max_results - len(seen), YOUTUBE_PAGE_SIZE),
                 'key': self.api_keys['youtube']
             }
+            if page_token:
+                search_params['pageToken'] = page_token
+            if order:
+                search_params['order'] = order
+            if published_after:
+                search_params['publishedAfter'] = published_after
+            if published_before:
+                search_params['publishedBefore'] = published_before
             
-            search_response = requests.get(search_url, params=search_params)
+            search_data = self._youtube_get('search', search_params)
             
-            if search_response.status_code != 200:
-                print(f"❌ Erro na busca: {search_response.status_code}")
-                return self._get_youtube_sample_data(hashtag)
+            if search_data is None:
+                if not seen:
+                    raise RuntimeError("a busca não retornou resultados válidos")
+                raise RuntimeError(f"a busca falhou depois de {len(seen)} vídeos")
             
-            search_data = search_response.json()
-            video_ids = [item['id']['videoId'] for item in search_data.get('items', [])]
+            # Páginas diferentes podem repetir vídeos
+            video_ids = []
+            cortados = 0
+            for item in search_data.get('items', []):
+                video_id = item['id']['videoId']
+                if video_id in seen:
+                    continue
+                if len(seen) < max_results:
+                    seen.add(video_id)
+                    video_ids.append(video_id)
+                else:
+                    cortados += 1
             
-            if not video_ids:
-                print("⚠️  Nenhum vídeo encontrado")
-                return []
+            if video_ids:
+                yield video_ids
             
-            # Obter estatísticas detalhadas
+            page_token = search_data.get('nextPageToken')
+            if not page_token:
+                # Última página, mas só esgota a busca se nenhum vídeo ficou de fora
+                if state is not None and not cortados:
+                    state['esgotada'] = True
+                return
+    
+    def _youtube_fetch_videos(self, video_ids: List[str],
+                              part: str = 'statistics,contentDetails,snippet',
+                              use_cache: bool = True) -> Dict[str, Dict]:
+        """
+        Consulta videos.list com 50 IDs por chamada (máximo da API)
+        
+        Args:
+            use_cache: Ver _youtube_get
+        
+        Returns:
+            Itens da API indexados pelo ID do vídeo, na ordem de video_ids
+        
+        Raises:
+            RuntimeError: Se algum lote falhar (os vídeos dele ficariam de fora)
+        """
+        items = {}
+        
+        for lote in self._chunks(video_ids, YOUTUBE_PAGE_SIZE):
             video_params = {
-                'part': 'statistics,contentDetails,snippet',
-                'id': ','.join(video_ids),
+                'part': part,
+                'id': ','.join(lote),
                 'key': self.api_keys['youtube']
             }
             
-            video_response = requests.get(video_url, params=video_params)
-            video_data = video_response.json()
+            video_data = self._youtube_get('videos', video_params, use_cache)
+            if video_data is None:
+                raise RuntimeError(f"videos.list falhou para um lote de {len(lote)} vídeos")
             
             for item in video_data.get('items', []):
-                duration = self._parse_youtube_duration(item['contentDetails']['duration'])
-                
-                video_info = {
-                    'plataforma': 'YouTube',
-                    'hashtag': hashtag,
-                    'perfil': item['snippet']['channelTitle'],
-                    'titulo': item['snippet']['title'],
-                    'video_id': item['id'],
-                    'likes': int(item['statistics'].get('likeCount', 0)),
-                    'comentarios': int(item['statistics'].get('commentCount', 0)),
-                    'visualizacoes': int(item['statistics'].get('viewCount', 0)),
-                    'salvamentos': 'N/A',  # YouTube não disponibiliza esse dado
-                    'duracao_segundos': duration,
-                    'duracao_formatada': self._format_duration(duration),
-                    'data_publicacao': item['snippet']['publishedAt'],
-                    'url': f"https://youtube.com/watch?v={item['id']}"
-                }
-                results.append(video_info)
-            
-            print(f"✅ {len(results)} vídeos coletados do YouTube")
-            return results
+                items[item['id']] = item
+        
+        return items
+    
+    def run_youtube_queue(self, hashtags: List[str], max_results: int = 50) -> Dict:
+        """
+        Executa uma fila de hashtags no YouTube dentro da quota restante
+        
+        Todas as hashtags recebem ao menos uma página antes de qualquer uma receber
+        a segunda; as que não cabem no orçamento de hoje são adiadas.
+        
+        Args:
+            hashtags: Hashtags a coletar (sem #)
+            max_results: Número máximo de resultados por hashtag
             
-        except Exception as e:
-            print(f"❌ Erro ao buscar no YouTube: {str(e)}")
-            return self._get_youtube_sample_data(hashtag)
+        Returns:
+            Dicionário com 'resultados' e 'adiadas' (também em self.deferred_jobs)
+        """
+        jobs = [(hashtag, max_results) for hashtag in hashtags]
+        
+        if self.quota:
+            pages = self.quota.pages_remaining(self._youtube_api_keys())
+            planned, deferred = plan_jobs(jobs, pages)
+        else:
+            planned, deferred = jobs, []
+        
+        results = []
+        for hashtag, n_results in planned:
+            results.extend(self.search_youtube(hashtag, n_results))
+        
+        if deferred:
+            print(f"⏳ Quota insuficiente hoje. Hashtags adiadas: {', '.join(deferred)}")
+        
+        self.deferred_jobs = deferred
+        return {'resultados': results, 'adiadas': deferred}
     
     def search_instagram(self, hashtag: str, max_results: int = 50) -> List[Dict]:
         """
@@ -168,44 +457,408 @@ class SocialMediaScraper:
             print(f"❌ Erro ao buscar no TikTok: {str(e)}")
             return self._get_tiktok_sample_data(hashtag)
     
-    def search_all_platforms(self, hashtag: str, max_results_per_platform: int = 30):
-        """Busca em todas as plataformas"""
+    def search_all_platforms(self, hashtag: str, max_results_per_platform: int = 30,
+                             concurrent: bool = True, incremental: bool = False) -> List[Dict]:
+        """
+        Busca em todas as plataformas
+        
+        Args:
+            hashtag: Hashtag para buscar (sem #)
+            max_results_per_platform: Número máximo de resultados por plataforma
+            concurrent: Se True, busca nas plataformas em paralelo
+            incremental: Se True, busca só conteúdo novo no YouTube e mescla o
+                resultado em self.data em vez de substituí-lo
+            
+        Returns:
+            Lista combinada na ordem YouTube, Instagram, TikTok. Erros de cada
+            plataforma ficam em self.errors sem descartar as demais.
+        """
         print(f"\n{'='*60}")
         print(f"INICIANDO COLETA DE DADOS - HASHTAG: #{hashtag}")
         print(f"{'='*60}\n")
         
+        results_by_platform = self._run_platforms(
+            {
+                plataforma: (lambda plataforma=plataforma: self._search_platform(
+                    plataforma, hashtag, max_results_per_platform, incremental
+                ))
+                for plataforma in PLATAFORMAS
+            },
+            concurrent
+        )
+        
         all_results = []
+        for plataforma in PLATAFORMAS:
+            all_results.extend(results_by_platform[plataforma])
+        
+        if incremental:
+            self.merge_data(all_results)
+        else:
+            self.data = all_results
+        
+        print(f"\n{'='*60}")
+        print(f"COLETA FINALIZADA")
+        print(f"Total de posts/vídeos coletados: {len(all_results)}")
+        if self.errors:
+            print(f"Plataformas com erro: {', '.join(self.errors)}")
+        print(f"{'='*60}\n")
+        
+        return all_results
+    
+    def iter_instagram(self, hashtag: str, max_results: int = 50) -> Iterator[Dict]:
+        """Versão em streaming de search_instagram"""
+        yield from self.search_instagram(hashtag, max_results)
+    
+    def iter_tiktok(self, hashtag: str, max_results: int = 50) -> Iterator[Dict]:
+        """Versão em streaming de search_tiktok"""
+        yield from self.search_tiktok(hashtag, max_results)
+    
+    def iter_all_platforms(self, hashtag: str, max_results_per_platform: int = 30,
+                           incremental: bool = False, buffer_size: int = 1000) -> Iterator[Dict]:
+        """
+        Versão em streaming de search_all_platforms
+        
+        As plataformas são consultadas em paralelo e cada registro é gerado assim
+        que chega, na ordem de chegada. A fila entre as buscas e o consumidor é
+        limitada a buffer_size registros, mantendo a memória constante. Não altera
+        self.data; erros de cada plataforma ficam em self.errors.
+        
+        Args:
+            hashtag: Hashtag para buscar (sem #)
+            max_results_per_platform: Número máximo de resultados por plataforma
+            incremental: Se True, busca só conteúdo novo no YouTube
+            buffer_size: Máximo de registros aguardando o consumidor
+            
+        Yields:
+            Registros normalizados de todas as plataformas
+        """
+        self.errors = {}
+        records = queue.Queue(maxsize=buffer_size)
+        stop = threading.Event()
+        done = object()
+        
+        def put(item):
+            # Desiste se o consumidor parou de ler (ex: break no for)
+            while not stop.is_set():
+                try:
+                    records.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce(plataforma):
+            try:
+                with self._platform_semaphores[plataforma]:
+                    if plataforma == 'youtube':
+                        source = self.iter_youtube(hashtag, max_results_per_platform, incremental)
+                    else:
+                        source = getattr(self, f'iter_{plataforma}')(hashtag, max_results_per_platform)
+                    for record in source:
+                        if not put(record):
+                            return
+            except Exception as e:
+                self.errors[plataforma] = str(e)
+                print(f"❌ Erro na coleta de {plataforma}: {str(e)}")
+            finally:
+                put(done)
+        
+        threads = [
+            threading.Thread(target=produce, args=(plataforma,), daemon=True)
+            for plataforma in PLATAFORMAS
+        ]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            finished = 0
+            while finished < len(threads):
+                item = records.get()
+                if item is done:
+                    finished += 1
+                else:
+                    yield item
+        finally:
+            stop.set()
+    
+    def _search_platform(self, plataforma: str, hashtag: str, max_results: int,
+                         incremental: bool = False) -> List[Dict]:
+        """Executa a busca de uma plataforma respeitando seu limite de concorrência"""
+        search = getattr(self, f'search_{plataforma}')
+        with self._platform_semaphores[plataforma]:
+            # Apenas o YouTube tem busca por data de publicação
+            if plataforma == 'youtube':
+                return search(hashtag, max_results, incremental=incremental)
+            return search(hashtag, max_results)
+    
+    def _run_platforms(self, tasks: Dict, concurrent: bool = True) -> Dict[str, List[Dict]]:
+        """
+        Executa uma tarefa por plataforma, em paralelo ou em sequência
+        
+        Args:
+            tasks: {plataforma: função sem argumentos que retorna a lista de registros}
+            concurrent: Se True, executa as plataformas em paralelo
+            
+        Returns:
+            {plataforma: registros}; plataformas com erro ficam vazias e o erro vai para self.errors
+        """
+        self.errors = {}
+        results_by_platform = {}
         
-        # YouTube
-        youtube_results = self.search_youtube(hashtag, max_results_per_platform)
-        all_results.extend(youtube_results)
-        time.sleep(1)  # Rate limiting
+        if concurrent:
+            # Tempo total = plataforma mais lenta, não a soma das três
+            with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+                futures = {
+                    plataforma: executor.submit(task)
+                    for plataforma, task in tasks.items()
+                }
+                for plataforma, future in futures.items():
+                    results_by_platform[plataforma] = self._collect_platform_result(
+                        plataforma, future.result
+                    )
+        else:
+            # Rate limiting fica a cargo do token bucket de cada plataforma (self.http)
+            for plataforma, task in tasks.items():
+                results_by_platform[plataforma] = self._collect_platform_result(plataforma, task)
+        
+        return results_by_platform
+    
+    def _collect_platform_result(self, plataforma: str, get_result) -> List[Dict]:
+        """Obtém o resultado de uma plataforma, registrando o erro sem interromper as outras"""
+        try:
+            return get_result()
+        except Exception as e:
+            self.errors[plataforma] = str(e)
+            print(f"❌ Erro na coleta de {plataforma}: {str(e)}")
+            return []
+    
+    def search_many(self, hashtags: List[str], max_results_per_platform: int = 30,
+                    concurrent: bool = True) -> List[Dict]:
+        """
+        Coleta várias hashtags num único job
         
-        # Instagram
-        instagram_results = self.search_instagram(hashtag, max_results_per_platform)
-        all_results.extend(instagram_results)
-        time.sleep(1)
+        No YouTube, os IDs de todas as hashtags são deduplicados e enriquecidos
+        juntos: videos.list é chamado uma vez a cada 50 vídeos únicos, mesmo que
+        um vídeo apareça em várias hashtags.
         
-        # TikTok
-        tiktok_results = self.search_tiktok(hashtag, max_results_per_platform)
-        all_results.extend(tiktok_results)
+        Args:
+            hashtags: Hashtags para buscar (sem #)
+            max_results_per_platform: Número máximo de resultados por plataforma e hashtag
+            concurrent: Se True, busca nas plataformas em paralelo
+            
+        Returns:
+            Um registro por (hashtag, vídeo). O mapa hashtag → video_ids fica em
+            self.hashtag_map.
+        """
+        print(f"\n{'='*60}")
+        print(f"INICIANDO COLETA DE DADOS - HASHTAGS: {', '.join('#' + h for h in hashtags)}")
+        print(f"{'='*60}\n")
+        
+        def search_each(plataforma):
+            results = []
+            for hashtag in hashtags:
+                results.extend(self._search_platform(plataforma, hashtag, max_results_per_platform))
+            return results
+        
+        tasks = {
+            plataforma: (lambda plataforma=plataforma: search_each(plataforma))
+            for plataforma in PLATAFORMAS
+        }
+        if self.api_keys['youtube']:
+            tasks['youtube'] = lambda: self._search_youtube_many(hashtags, max_results_per_platform)
+        
+        results_by_platform = self._run_platforms(tasks, concurrent)
+        
+        all_results = []
+        for plataforma in PLATAFORMAS:
+            all_results.extend(results_by_platform[plataforma])
+        
+        self.hashtag_map = defaultdict(list)
+        for record in all_results:
+            self.hashtag_map[record['hashtag']].append(record['video_id'])
+        self.hashtag_map = dict(self.hashtag_map)
         
         self.data = all_results
         
         print(f"\n{'='*60}")
         print(f"COLETA FINALIZADA")
         print(f"Total de posts/vídeos coletados: {len(all_results)}")
+        if self.errors:
+            print(f"Plataformas com erro: {', '.join(self.errors)}")
         print(f"{'='*60}\n")
         
         return all_results
     
-    def export_to_excel(self, filename: str = "dados_redes_sociais.xlsx"):
-        """Exporta os dados para Excel com abas separadas por plataforma e MINUTAGEM destacada"""
+    def _search_youtube_many(self, hashtags: List[str], max_results: int) -> List[Dict]:
+        """Busca várias hashtags no YouTube com um único enriquecimento dos IDs únicos"""
+        ids_by_hashtag = {}
+        
+        with self._platform_semaphores['youtube']:
+            for hashtag in hashtags:
+                print(f"🔍 Buscando vídeos no YouTube com hashtag: #{hashtag}")
+                ids_by_hashtag[hashtag] = []
+                try:
+                    for video_ids in self._youtube_search_pages(hashtag, max_results):
+                        ids_by_hashtag[hashtag].extend(video_ids)
+                except QuotaExceededError as e:
+                    print(f"⛔ {str(e)}. Hashtags restantes não serão buscadas.")
+                    break
+                except Exception as e:
+                    print(f"❌ Erro ao buscar #{hashtag} no YouTube: {str(e)}")
+            
+            unique_ids = list(dict.fromkeys(
+                video_id for video_ids in ids_by_hashtag.values() for video_id in video_ids
+            ))
+            print(f"   ↪ {len(unique_ids)} vídeos únicos em {len(ids_by_hashtag)} hashtags")
+            
+            try:
+                items = self._youtube_fetch_videos(unique_ids)
+            except QuotaExceededError as e:
+                print(f"⛔ {str(e)}. Estatísticas não coletadas.")
+                items = {}
+        
+        results = []
+        for hashtag, video_ids in ids_by_hashtag.items():
+            for video_id in video_ids:
+                if video_id in items:
+                    results.append(self._youtube_video_info(items[video_id], hashtag))
+        
+        print(f"✅ {len(results)} vídeos coletados do YouTube")
+        return results
+    
+    def refresh_statistics(self, video_ids: List[str] = None) -> List[Dict]:
+        """
+        Atualiza likes, comentários e visualizações de vídeos do YouTube já coletados
+        
+        Não faz buscas: consulta apenas videos.list?part=statistics, 50 IDs por
+        chamada (1 unidade de quota cada). Os registros de self.data são
+        atualizados no lugar e cada leitura é anexada a self.snapshots.
+        
+        Args:
+            video_ids: IDs a atualizar (padrão: todos os vídeos do YouTube em self.data)
+            
+        Returns:
+            Snapshots gerados nesta atualização
+        """
+        if not self.api_keys['youtube']:
+            print("⚠️  API Key do YouTube não configurada. Nada a atualizar.")
+            return []
+        
+        if video_ids is None:
+            video_ids = [
+                video_id
+                for video_id, plataforma in zip(self.data.column('video_id'), self.data.column('plataforma'))
+                if plataforma == 'YouTube'
+            ]
+        video_ids = list(dict.fromkeys(video_ids))
+        
+        print(f"🔄 Atualizando estatísticas de {len(video_ids)} vídeos do YouTube")
+        
+        try:
+            # Contadores do cache seriam gravados como uma leitura nova
+            items = self._youtube_fetch_videos(video_ids, part='statistics', use_cache=False)
+        except QuotaExceededError as e:
+            print(f"⛔ {str(e)}. Estatísticas não atualizadas.")
+            return []
+        except Exception as e:
+            print(f"❌ Erro ao atualizar estatísticas: {str(e)}")
+            return []
+        
+        coletado_em = datetime.now().isoformat(timespec='seconds')
+        snapshots = []
+        for video_id, item in items.items():
+            statistics = item.get('statistics', {})
+            snapshots.append({
+                'video_id': video_id,
+                'coletado_em': coletado_em,
+                'likes': int(statistics.get('likeCount', 0)),
+                'comentarios': int(statistics.get('commentCount', 0)),
+                'visualizacoes': int(statistics.get('viewCount', 0))
+            })
+        
+        latest = {snapshot['video_id']: snapshot for snapshot in snapshots}
+        rows = zip(self.data.column('video_id'), self.data.column('plataforma'))
+        for i, (video_id, plataforma) in enumerate(rows):
+            snapshot = latest.get(video_id)
+            if plataforma == 'YouTube' and snapshot:
+                self.data.update(
+                    i,
+                    likes=snapshot['likes'],
+                    comentarios=snapshot['comentarios'],
+                    visualizacoes=snapshot['visualizacoes']
+                )
+        
+        self.snapshots.extend(snapshots)
+        print(f"✅ {len(snapshots)} vídeos atualizados")
+        return snapshots
+    
+    def lookup_youtube_videos(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Consulta vídeos do YouTube já conhecidos pelo ID, sem buscas
+        
+        Usa apenas videos.list (50 IDs por chamada, 1 unidade de quota cada),
+        então é muito mais barato que uma busca e que um yt-dlp por vídeo.
+        
+        Returns:
+            Registros no formato padrão indexados pelo ID; vídeos privados,
+            removidos ou sem duração ficam de fora
+        """
+        items = self._youtube_fetch_videos(list(dict.fromkeys(video_ids)))
+        
+        videos = {}
+        for video_id, item in items.items():
+            try:
+                videos[video_id] = self._youtube_video_info(item, '')
+            except KeyError:
+                continue
+        
+        return videos
+    
+    def merge_data(self, records: List[Dict]) -> RecordStore:
+        """
+        Mescla registros em self.data, atualizando os que já existem
+        
+        Registros são identificados por (plataforma, hashtag, video_id).
+        """
+        index = {
+            key: i
+            for i, key in enumerate(zip(
+                self.data.column('plataforma'), self.data.column('hashtag'), self.data.column('video_id')
+            ))
+        }
+        
+        for record in records:
+            key = (record['plataforma'], record['hashtag'], record['video_id'])
+            if key in index:
+                self.data.set_row(index[key], record)
+            else:
+                index[key] = len(self.data)
+                self.data.append(record)
+        
+        return self.data
+    
+    def export_to_excel(self, filename: str = "dados_redes_sociais.xlsx", fast: bool = False,
+                        max_rows_per_sheet: int = EXCEL_MAX_ROWS - 1):
+        """
+        Exporta os dados para Excel com abas separadas por plataforma e MINUTAGEM destacada
+        
+        Args:
+            filename: Arquivo .xlsx de saída (ou buffer binário, ver export_to_excel_bytes)
+            fast: Escrita em streaming (constant_memory do xlsxwriter), linha a linha,
+                com o destaque de MINUTAGEM como formato de coluna; tempo e memória
+                crescem linearmente, indicado para centenas de milhares de linhas
+            max_rows_per_sheet: Registros por aba; TODOS OS DADOS e as abas de
+                plataforma maiores que isso continuam em "YouTube (2)", "YouTube (3)"...
+                Os resumos sempre consideram todos os registros.
+        """
         if not self.data:
             print("⚠️  Nenhum dado para exportar")
             return
         
-        df = pd.DataFrame(self.data)
+        if fast:
+            return self._export_to_excel_fast(filename, max_rows_per_sheet)
+        
+        df = self.data.to_dataframe()
         
         # Renomear coluna para destacar MINUTAGEM
         df = df.rename(columns={'duracao_formatada': 'MINUTAGEM'})
@@ -238,98 +891,75 @@ class SocialMediaScraper:
             number_format = workbook.add_format({'num_format': '#,##0'})
             
             # ABA 1: TODOS OS DADOS
-            df_todos = df.copy()
-            df_todos.to_excel(writer, sheet_name='TODOS OS DADOS', index=False)
-            
-            worksheet = writer.sheets['TODOS OS DADOS']
-            for col_num, value in enumerate(df_todos.columns.values):
-                worksheet.write(0, col_num, value, header_format)
-            
-            # Destacar coluna MINUTAGEM
-            if 'MINUTAGEM' in df_todos.columns:
-                minutagem_col = df_todos.columns.get_loc('MINUTAGEM')
-                for row in range(1, len(df_todos) + 1):
-                    worksheet.write(row, minutagem_col, df_todos.iloc[row-1]['MINUTAGEM'], minutagem_format)
-            
-            worksheet.set_column('A:A', 12)  # Plataforma
-            worksheet.set_column('B:B', 15)  # Hashtag
-            worksheet.set_column('C:C', 20)  # Perfil
-            worksheet.set_column('D:D', 40)  # Título
-            worksheet.set_column('E:E', 15)  # Video ID
-            worksheet.set_column('F:H', 12)  # Likes, Comentários, Visualizações
-            worksheet.set_column('I:I', 12)  # Salvamentos
-            worksheet.set_column('J:J', 15)  # Duração segundos
-            worksheet.set_column('K:K', 16)  # MINUTAGEM (destaque)
-            worksheet.set_column('L:L', 12)  # Data
-            worksheet.set_column('M:M', 50)  # URL
-            
-            # ABA 2, 3, 4: UMA PARA CADA PLATAFORMA
-            plataformas = df['plataforma'].unique()
-            
-            for plataforma in sorted(plataformas):
-                df_plataforma = df[df['plataforma'] == plataforma].copy()
-                
-                # Remover coluna de plataforma já que está implícito
-                df_plataforma = df_plataforma.drop('plataforma', axis=1)
-                
-                sheet_name = f'{plataforma}'
-                df_plataforma.to_excel(writer, sheet_name=sheet_name, index=False)
+            for sheet_name, inicio, fim in self._sheet_shards('TODOS OS DADOS', len(df), max_rows_per_sheet):
+                df_todos = df.iloc[inicio:fim]
+                df_todos.to_excel(writer, sheet_name=sheet_name, index=False, na_rep='N/A')
                 
                 worksheet = writer.sheets[sheet_name]
-                
-                # Aplicar formato aos cabeçalhos
-                for col_num, value in enumerate(df_plataforma.columns.values):
+                for col_num, value in enumerate(df_todos.columns.values):
                     worksheet.write(0, col_num, value, header_format)
                 
                 # Destacar coluna MINUTAGEM
-                if 'MINUTAGEM' in df_plataforma.columns:
-                    minutagem_col = df_plataforma.columns.get_loc('MINUTAGEM')
-                    for row in range(1, len(df_plataforma) + 1):
-                        worksheet.write(row, minutagem_col, df_plataforma.iloc[row-1]['MINUTAGEM'], minutagem_format)
+                if 'MINUTAGEM' in df_todos.columns:
+                    minutagem_col = df_todos.columns.get_loc('MINUTAGEM')
+                    for row in range(1, len(df_todos) + 1):
+                        worksheet.write(row, minutagem_col, df_todos.iloc[row-1]['MINUTAGEM'], minutagem_format)
                 
-                # Ajustar largura das colunas
-                worksheet.set_column('A:A', 15)  # Hashtag
-                worksheet.set_column('B:B', 20)  # Perfil
-                worksheet.set_column('C:C', 40)  # Título
-                worksheet.set_column('D:D', 15)  # Video ID
-                worksheet.set_column('E:G', 12)  # Likes, Comentários, Visualizações
-                worksheet.set_column('H:H', 12)  # Salvamentos
-                worksheet.set_column('I:I', 15)  # Duração segundos
-                worksheet.set_column('J:J', 16)  # MINUTAGEM (destaque)
-                worksheet.set_column('K:K', 12)  # Data
-                worksheet.set_column('L:L', 50)  # URL
+                worksheet.set_column('A:A', 12)  # Plataforma
+                worksheet.set_column('B:B', 15)  # Hashtag
+                worksheet.set_column('C:C', 20)  # Perfil
+                worksheet.set_column('D:D', 40)  # Título
+                worksheet.set_column('E:E', 15)  # Video ID
+                worksheet.set_column('F:H', 12)  # Likes, Comentários, Visualizações
+                worksheet.set_column('I:I', 12)  # Salvamentos
+                worksheet.set_column('J:J', 15)  # Duração segundos
+                worksheet.set_column('K:K', 16)  # MINUTAGEM (destaque)
+                worksheet.set_column('L:L', 12)  # Data
+                worksheet.set_column('M:M', 50)  # URL
                 
-                print(f"   ✅ Aba '{plataforma}' criada com {len(df_plataforma)} posts - MINUTAGEM incluída")
+            # ABA 2, 3, 4: UMA PARA CADA PLATAFORMA
+            aggregates = self.aggregates()
+            plataformas = sorted(aggregates.posicoes)
             
+            for plataforma in plataformas:
+                posicoes = aggregates.posicoes[plataforma]
+                
+                for sheet_name, inicio, fim in self._sheet_shards(plataforma, len(posicoes), max_rows_per_sheet):
+                    df_plataforma = df.take(posicoes[inicio:fim])
+                    
+                    # Remover coluna de plataforma já que está implícito
+                    df_plataforma = df_plataforma.drop('plataforma', axis=1)
+                    
+                    df_plataforma.to_excel(writer, sheet_name=sheet_name, index=False, na_rep='N/A')
+                    
+                    worksheet = writer.sheets[sheet_name]
+                    
+                    # Aplicar formato aos cabeçalhos
+                    for col_num, value in enumerate(df_plataforma.columns.values):
+                        worksheet.write(0, col_num, value, header_format)
+                    
+                    # Destacar coluna MINUTAGEM
+                    if 'MINUTAGEM' in df_plataforma.columns:
+                        minutagem_col = df_plataforma.columns.get_loc('MINUTAGEM')
+                        for row in range(1, len(df_plataforma) + 1):
+                            worksheet.write(row, minutagem_col, df_plataforma.iloc[row-1]['MINUTAGEM'], minutagem_format)
+                    
+                    # Ajustar largura das colunas
+                    worksheet.set_column('A:A', 15)  # Hashtag
+                    worksheet.set_column('B:B', 20)  # Perfil
+                    worksheet.set_column('C:C', 40)  # Título
+                    worksheet.set_column('D:D', 15)  # Video ID
+                    worksheet.set_column('E:G', 12)  # Likes, Comentários, Visualizações
+                    worksheet.set_column('H:H', 12)  # Salvamentos
+                    worksheet.set_column('I:I', 15)  # Duração segundos
+                    worksheet.set_column('J:J', 16)  # MINUTAGEM (destaque)
+                    worksheet.set_column('K:K', 12)  # Data
+                    worksheet.set_column('L:L', 50)  # URL
+                    
+                    print(f"   ✅ Aba '{sheet_name}' criada com {len(df_plataforma)} posts - MINUTAGEM incluída")
+                
             # ABA: RESUMO POR PLATAFORMA COM MINUTAGEM
-            stats = df.groupby('plataforma').agg({
-                'likes': 'sum',
-                'comentarios': 'sum',
-                'perfil': 'count',
-                'duracao_segundos': ['mean', 'min', 'max']
-            })
-            
-            stats.columns = ['total_likes', 'total_comentarios', 'total_posts', 
-                           'duracao_media_seg', 'duracao_min_seg', 'duracao_max_seg']
-            
-            # Adicionar taxa de engajamento
-            stats['engajamento_total'] = stats['total_likes'] + stats['total_comentarios']
-            stats['media_likes_por_post'] = (stats['total_likes'] / stats['total_posts']).round(0)
-            
-            # Formatar durações
-            stats['MINUTAGEM_MÉDIA'] = stats['duracao_media_seg'].apply(
-                lambda x: self._format_duration(int(x))
-            )
-            stats['MINUTAGEM_MÍNIMA'] = stats['duracao_min_seg'].apply(
-                lambda x: self._format_duration(int(x))
-            )
-            stats['MINUTAGEM_MÁXIMA'] = stats['duracao_max_seg'].apply(
-                lambda x: self._format_duration(int(x))
-            )
-            
-            # Reorganizar colunas
-            stats = stats[['total_posts', 'total_likes', 'total_comentarios', 'engajamento_total', 
-                          'media_likes_por_post', 'MINUTAGEM_MÉDIA', 'MINUTAGEM_MÍNIMA', 'MINUTAGEM_MÁXIMA']]
+            stats, top_perfis = self._excel_summaries(aggregates)
             
             stats.to_excel(writer, sheet_name='RESUMO COM MINUTAGEM')
             
@@ -348,51 +978,320 @@ class SocialMediaScraper:
             worksheet.set_column('B:H', 18)
             
             # ABA: TOP 20 PERFIS
-            top_perfis = df.groupby(['plataforma', 'perfil']).agg({
-                'likes': 'sum',
-                'comentarios': 'sum',
-                'perfil': 'count'
-            }).rename(columns={'perfil': 'total_posts'})
-            
-            top_perfis['engajamento_total'] = top_perfis['likes'] + top_perfis['comentarios']
-            top_perfis = top_perfis.sort_values('likes', ascending=False).head(20)
-            
             top_perfis.to_excel(writer, sheet_name='Top 20 Perfis')
             
             worksheet = writer.sheets['Top 20 Perfis']
-            for col_num, value in enumerate(['Plataforma', 'Perfil', 'Total Likes', 'Total Comentários', 'Engajamento Total']):
+            for col_num, value in enumerate(TOP_PERFIS_HEADERS):
                 worksheet.write(0, col_num, value, header_format)
             worksheet.set_column('A:A', 15)
             worksheet.set_column('B:B', 25)
             worksheet.set_column('C:E', 18)
         
-        print(f"\n✅ Excel exportado com sucesso: {filename}")
+        print(f"\n✅ Excel exportado com sucesso: {filename if isinstance(filename, str) else 'em memória'}")
         print(f"   📊 Contém {len(plataformas)} abas de plataformas + abas de análise")
         print(f"   ⏱️  MINUTAGEM destacada em AMARELO em todas as abas")
         return filename
     
+    def export_to_excel_bytes(self, **options) -> bytes:
+        """
+        Gera o mesmo Excel de export_to_excel em memória, sem arquivo em disco
+        (ex: para o st.download_button)
+        
+        Args:
+            **options: Repassadas ao export_to_excel (fast, max_rows_per_sheet)
+        
+        Returns:
+            Conteúdo do .xlsx, ou None se não houver dados
+        """
+        buffer = io.BytesIO()
+        if self.export_to_excel(buffer, **options) is None:
+            return None
+        return buffer.getvalue()
+    
+    def export(self, filename: str, **options):
+        """
+        Exporta os dados no formato indicado pela extensão do arquivo
+        
+        .xlsx usa export_to_excel; .csv, .jsonl e .parquet usam os exportadores
+        em streaming de exporters.py (Parquet com o esquema tipado do RecordStore).
+        
+        Args:
+            filename: Arquivo de saída
+            **options: Repassadas ao exportador (ex: fast=True no Excel,
+                compression='snappy' no Parquet)
+        """
+        if filename.lower().endswith('.xlsx'):
+            return self.export_to_excel(filename, **options)
+        
+        if not self.data:
+            print("⚠️  Nenhum dado para exportar")
+            return
+        
+        with open_exporter(filename, **options) as exporter:
+            exporter.write(self.data)
+        
+        print(f"\n✅ {exporter.rows} registros exportados: {filename}")
+        return filename
+    
+    def aggregates(self) -> Aggregates:
+        """
+        Métricas por perfil, por plataforma e gerais (ver aggregations.aggregate)
+        
+        Calculadas numa única passada sobre self.data e reaproveitadas até os
+        dados mudarem (append, update, merge ou nova atribuição de self.data).
+        """
+        store = self.data
+        if self._aggregates is None or self._aggregates[0] is not store or self._aggregates[1] != store.version:
+            self._aggregates = (store, store.version, aggregate(store))
+        return self._aggregates[2]
+    
     def get_statistics(self) -> Dict:
         """Calcula estatísticas gerais dos dados coletados"""
         if not self.data:
             return {}
         
-        df = pd.DataFrame(self.data)
+        aggregates = self.aggregates()
+        total = aggregates.total
         
         stats = {
-            'total_posts': len(df),
-            'total_likes': df['likes'].sum(),
-            'total_comentarios': df['comentarios'].sum(),
-            'media_likes': df['likes'].mean(),
-            'media_comentarios': df['comentarios'].mean(),
-            'por_plataforma': df.groupby('plataforma').size().to_dict(),
-            'duracao_media_segundos': df['duracao_segundos'].mean(),
-            'perfis_unicos': df['perfil'].nunique()
+            'total_posts': total['total_posts'],
+            'total_likes': total['total_likes'],
+            'total_comentarios': total['total_comentarios'],
+            'media_likes': total['total_likes'] / total['total_posts'],
+            'media_comentarios': total['total_comentarios'] / total['total_posts'],
+            'por_plataforma': aggregates.por_plataforma['posts'].to_dict(),
+            'duracao_media_segundos': total['duracao_total'] / total['total_posts'],
+            'perfis_unicos': total['perfis_unicos']
         }
         
         return stats
     
     # Métodos auxiliares
     
+    def _excel_summaries(self, aggregates: Aggregates):
+        """
+        Tabelas das abas de análise do Excel, a partir das agregações
+        
+        Returns:
+            (resumo por plataforma com MINUTAGEM, top 20 perfis)
+        """
+        # Resumo por plataforma com MINUTAGEM
+        por_plataforma = aggregates.por_plataforma
+        stats = pd.DataFrame({
+            'total_posts': por_plataforma['posts'],
+            'total_likes': por_plataforma['likes'],
+            'total_comentarios': por_plataforma['comentarios'],
+            'engajamento_total': por_plataforma['likes'] + por_plataforma['comentarios'],
+            'media_likes_por_post': (por_plataforma['likes'] / por_plataforma['posts']).round(0)
+        })
+        
+        # Formatar durações
+        duracoes = {
+            'MINUTAGEM_MÉDIA': por_plataforma['duracao_total'] / por_plataforma['posts'],
+            'MINUTAGEM_MÍNIMA': por_plataforma['duracao_min'],
+            'MINUTAGEM_MÁXIMA': por_plataforma['duracao_max']
+        }
+        for column, values in duracoes.items():
+            stats[column] = values.apply(lambda x: self._format_duration(int(x)))
+        
+        # Top 20 perfis por likes
+        por_perfil = aggregates.por_perfil
+        top_perfis = pd.DataFrame({
+            'likes': por_perfil['likes'],
+            'comentarios': por_perfil['comentarios'],
+            'total_posts': por_perfil['posts'],
+            'engajamento_total': por_perfil['likes'] + por_perfil['comentarios']
+        })
+        top_perfis = top_perfis.sort_values('likes', ascending=False).head(20)
+        
+        return stats, top_perfis
+    
+    def _export_to_excel_fast(self, filename: str, max_rows_per_sheet: int = EXCEL_MAX_ROWS - 1):
+        """Versão em streaming de export_to_excel (ver o parâmetro fast)"""
+        import xlsxwriter
+        
+        headers = ['MINUTAGEM' if column == 'duracao_formatada' else column for column in COLUMNS]
+        minutagem_col = headers.index('MINUTAGEM')
+        
+        aggregates = self.aggregates()
+        posicoes = aggregates.posicoes
+        
+        # constant_memory grava cada linha no disco assim que a próxima começa
+        workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+        try:
+            header_format = workbook.add_format({
+                'bold': True,
+                'bg_color': '#4472C4',
+                'font_color': 'white',
+                'border': 1,
+                'align': 'center',
+                'valign': 'vcenter',
+                'font_size': 11
+            })
+            minutagem_format = workbook.add_format({
+                'bg_color': '#FFF2CC',
+                'bold': True,
+                'align': 'center',
+                'font_size': 11,
+                'border': 1
+            })
+            
+            # ABA 1: TODOS OS DADOS (o mesmo iterador de linhas continua em cada parte)
+            rows = self._excel_rows()
+            for sheet_name, inicio, fim in self._sheet_shards('TODOS OS DADOS', len(self.data), max_rows_per_sheet):
+                self._write_excel_sheet(
+                    workbook.add_worksheet(sheet_name), headers, islice(rows, fim - inicio),
+                    EXCEL_COLUMN_WIDTHS, header_format, {minutagem_col: minutagem_format}
+                )
+            
+            # ABA 2, 3, 4: UMA PARA CADA PLATAFORMA (sem a coluna plataforma)
+            for plataforma in sorted(posicoes):
+                indices = posicoes[plataforma]
+                for sheet_name, inicio, fim in self._sheet_shards(plataforma, len(indices), max_rows_per_sheet):
+                    self._write_excel_sheet(
+                        workbook.add_worksheet(sheet_name), headers[1:],
+                        self._excel_rows(indices[inicio:fim], skip=1),
+                        EXCEL_COLUMN_WIDTHS[1:], header_format, {minutagem_col - 1: minutagem_format}
+                    )
+                    print(f"   ✅ Aba '{sheet_name}' criada com {fim - inicio} posts - MINUTAGEM incluída")
+            
+            stats, top_perfis = self._excel_summaries(aggregates)
+            
+            # ABA: RESUMO POR PLATAFORMA COM MINUTAGEM
+            destaque = {
+                list(stats.columns).index(column) + 1: minutagem_format
+                for column in ('MINUTAGEM_MÉDIA', 'MINUTAGEM_MÍNIMA', 'MINUTAGEM_MÁXIMA')
+            }
+            self._write_excel_sheet(
+                workbook.add_worksheet('RESUMO COM MINUTAGEM'), ['Plataforma'] + list(stats.columns),
+                stats.itertuples(name=None), (15,) + (18,) * len(stats.columns),
+                header_format, destaque
+            )
+            
+            # ABA: TOP 20 PERFIS
+            self._write_excel_sheet(
+                workbook.add_worksheet('Top 20 Perfis'), TOP_PERFIS_HEADERS,
+                # Plataforma/perfil ausentes ficam em branco, como no modo padrão
+                (
+                    tuple(None if pd.isna(value) else value for value in index) + tuple(values)
+                    for index, *values in top_perfis.itertuples(name=None)
+                ),
+                (15, 25, 18, 18, 18, 18), header_format
+            )
+        finally:
+            workbook.close()
+        
+        print(f"\n✅ Excel exportado com sucesso: {filename if isinstance(filename, str) else 'em memória'}")
+        print(f"   📊 Contém {len(posicoes)} abas de plataformas + abas de análise")
+        print(f"   ⏱️  MINUTAGEM destacada em AMARELO em todas as abas")
+        return filename
+    
+    def _excel_rows(self, positions=None, skip: int = 0) -> Iterator[List]:
+        """
+        Registros do store como linhas do Excel, lidos em blocos (RecordStore.iter_rows),
+        com 'N/A' nos ausentes e sem as `skip` primeiras colunas
+        """
+        for row in self.data.iter_rows(positions):
+            yield ['N/A' if value is None or value is pd.NA else value for value in row[skip:]]
+    
+    @staticmethod
+    def _sheet_shards(name: str, total: int, max_rows: int):
+        """
+        Divide uma aba de total registros em partes de até max_rows
+        
+        Yields:
+            (nome da aba, início, fim): "YouTube", "YouTube (2)", "YouTube (3)"...
+            Sempre há ao menos uma parte, mesmo sem registros.
+        """
+        if not 0 < max_rows < EXCEL_MAX_ROWS:
+            raise ValueError(f"max_rows_per_sheet deve estar entre 1 e {EXCEL_MAX_ROWS - 1}")
+        
+        for parte, inicio in enumerate(range(0, max(total, 1), max_rows), 1):
+            sheet_name = name if parte == 1 else f'{name} ({parte})'
+            yield sheet_name, inicio, min(inicio + max_rows, total)
+    
+    @staticmethod
+    def _write_excel_sheet(worksheet, headers, rows, widths, header_format, column_formats=None):
+        """
+        Grava uma aba linha a linha (compatível com constant_memory)
+        
+        Os formatos de coluna (ex: destaque de MINUTAGEM) são definidos uma vez no
+        set_column e valem para todas as células gravadas sem formato próprio.
+        """
+        column_formats = column_formats or {}
+        for col, width in enumerate(widths):
+            worksheet.set_column(col, col, width, column_formats.get(col))
+        
+        worksheet.write_row(0, 0, headers, header_format)
+        for row_num, row in enumerate(rows, 1):
+            worksheet.write_row(row_num, 0, row)
+    
+    def _youtube_get(self, endpoint: str, params: Dict, use_cache: bool = True) -> Dict:
+        """
+        GET na YouTube Data API, consultando o cache antes quando ativado
+        
+        Args:
+            use_cache: Se False, sempre consulta a API (a resposta ainda atualiza o cache)
+        
+        Returns:
+            JSON da resposta, ou None se a API responder com erro
+        """
+        if self.cache and use_cache:
+            cached = self.cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+        
+        if self.quota:
+            # Debita o custo da primeira chave com saldo (levanta QuotaExceededError)
+            api_key = self.quota.reserve(self._youtube_api_keys(), QUOTA_COSTS[endpoint])
+            params = dict(params, key=api_key)
+        
+        response = self.http.get(f"{YOUTUBE_API_URL}/{endpoint}", params=params, plataforma='youtube')
+        
+        if self.quota and response.status_code == 403 and 'quotaExceeded' in response.text:
+            # A API discorda da nossa contagem: marca a chave como esgotada e tenta a próxima
+            self.quota.mark_exhausted(params['key'])
+            return self._youtube_get(endpoint, params, use_cache)
+        
+        if response.status_code != 200:
+            print(f"❌ Erro na busca: {response.status_code}")
+            return None
+        
+        data = response.json()
+        if self.cache:
+            self.cache.set(endpoint, params, data)
+        return data
+    
+    def _youtube_video_info(self, item: Dict, hashtag: str) -> Dict:
+        """Converte um item de videos.list no registro padrão de vídeo"""
+        duration = self._parse_youtube_duration(item['contentDetails']['duration'])
+        
+        return {
+            'plataforma': 'YouTube',
+            'hashtag': hashtag,
+            'perfil': item['snippet']['channelTitle'],
+            'titulo': item['snippet']['title'],
+            'video_id': item['id'],
+            'likes': int(item['statistics'].get('likeCount', 0)),
+            'comentarios': int(item['statistics'].get('commentCount', 0)),
+            'visualizacoes': int(item['statistics'].get('viewCount', 0)),
+            'salvamentos': 'N/A',  # YouTube não disponibiliza esse dado
+            'duracao_segundos': duration,
+            'duracao_formatada': self._format_duration(duration),
+            'data_publicacao': item['snippet']['publishedAt'],
+            'url': f"https://youtube.com/watch?v={item['id']}"
+        }
+    
+    def _youtube_api_keys(self) -> List[str]:
+        """API keys do YouTube em ordem de uso"""
+        return self.youtube_keys or [self.api_keys['youtube']]
+    
+    @staticmethod
+    def _chunks(items: List, size: int):
+        """Divide uma lista em lotes de até `size` itens"""
+        for i in range(0, len(items), size):
+            yield items[i:i + size]
+    
     @staticmethod
     def _parse_youtube_duration(duration: str) -> int:
         """Converte duração ISO 8601 do YouTube para segundos"""
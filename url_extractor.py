@@ -0,0 +1,465 @@
+"""
+Extração de minutagem a partir de URLs
+Motor usado pelo upload de planilhas do dashboard: cache de metadados, API do YouTube
+(videos.list em lote) quando há chave e, para o restante, yt-dlp com várias URLs em
+paralelo, usando a biblioteca yt_dlp no próprio processo e o executável como alternativa
+"""
+
+import json
+import re
+import subprocess
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+from cache import MetadataCache
+from domain_scheduler import DomainScheduler
+from job_journal import JobJournal
+from social_media_scraper import SocialMediaScraper
+from url_normalizer import VideoRef, normalizar_url
+
+try:
+    import yt_dlp
+except ImportError:
+    yt_dlp = None
+
+# Downloads simultâneos padrão do yt-dlp
+DEFAULT_WORKERS = 8
+
+# Opções do YoutubeDL em processo: só metadados, sem download e sem saída no console
+YTDL_OPTIONS = {
+    'quiet': True,
+    'no_warnings': True,
+    'skip_download': True,
+    'noplaylist': True,
+    'socket_timeout': 30
+}
+
+# Uma instância de YoutubeDL por thread do pool
+_local = threading.local()
+
+# Erros que indicam bloqueio ou sobrecarga do site (e não vídeo privado, removido...)
+ERRO_BLOQUEIO = re.compile(r'\b(429|403)\b|too many requests|forbidden|rate.?limit|timed? ?out', re.IGNORECASE)
+
+
+def extrair_duracao_url(url, backend: str = 'auto'):
+    """
+    Extrai duração usando yt-dlp (sem API)
+
+    Args:
+        url: URL do vídeo
+        backend: 'inprocess' (biblioteca yt_dlp), 'subprocess' (executável yt-dlp)
+            ou 'auto' (biblioteca quando instalada, executável como alternativa)
+    """
+    try:
+        if backend == 'subprocess' or (backend == 'auto' and yt_dlp is None):
+            data = _extrair_info_subprocess(url)
+        else:
+            try:
+                data = _extrair_info_em_processo(url)
+            except yt_dlp.utils.DownloadError:
+                # Erro do próprio site (vídeo privado, 429...): a mensagem vai para o status
+                raise
+            except Exception:
+                if backend != 'auto':
+                    raise
+                # Falha inesperada da biblioteca: tenta o executável
+                data = _extrair_info_subprocess(url)
+
+        if data:
+            duracao_seg = data.get('duration', 0)
+
+            if duracao_seg:
+                horas = int(duracao_seg // 3600)
+                minutos = int((duracao_seg % 3600) // 60)
+                segundos = int(duracao_seg % 60)
+
+                if horas > 0:
+                    duracao_fmt = f"{horas:02d}:{minutos:02d}:{segundos:02d}"
+                else:
+                    duracao_fmt = f"{minutos:02d}:{segundos:02d}"
+
+                # Extrair título se disponível
+                titulo = data.get('title', 'Sem título')
+                criador = data.get('uploader', data.get('channel', 'Desconhecido'))
+
+                return {
+                    'segundos': duracao_seg,
+                    'formatada': duracao_fmt,
+                    'titulo': titulo,
+                    'criador': criador,
+                    'status': 'ok'
+                }
+
+        return {'segundos': 0, 'formatada': 'Erro', 'status': 'erro'}
+
+    except Exception as e:
+        return {'segundos': 0, 'formatada': 'Erro', 'status': f'erro: {str(e)}'}
+
+
+def yt_dlp_disponivel() -> bool:
+    """Indica se a biblioteca yt_dlp ou o executável yt-dlp estão instalados"""
+    if yt_dlp is not None:
+        return True
+    try:
+        subprocess.run(['yt-dlp', '--version'], capture_output=True, check=True)
+        return True
+    except Exception:
+        return False
+
+
+def _get_ydl():
+    """Instância de YoutubeDL da thread atual, criada uma vez e reaproveitada"""
+    ydl = getattr(_local, 'ydl', None)
+    if ydl is None:
+        ydl = yt_dlp.YoutubeDL(YTDL_OPTIONS)
+        _local.ydl = ydl
+    return ydl
+
+
+def _extrair_info_em_processo(url) -> Optional[Dict]:
+    """Metadados via biblioteca yt_dlp, sem iniciar um novo processo"""
+    ydl = _get_ydl()
+    # process=False pula a seleção de formatos; basta para duração/título/canal
+    data = ydl.extract_info(url, download=False, process=False)
+
+    # Alguns extratores apenas redirecionam para outra URL; resolve por completo
+    if data and data.get('_type') in ('url', 'url_transparent'):
+        data = ydl.extract_info(url, download=False)
+
+    return data
+
+
+def _extrair_info_subprocess(url) -> Optional[Dict]:
+    """Metadados via executável yt-dlp (um processo por URL)"""
+    cmd = ['yt-dlp', '--dump-json', '--no-playlist', '--no-warnings', url]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+
+    if result.returncode == 0:
+        return json.loads(result.stdout)
+    raise RuntimeError(result.stderr.strip() or f'yt-dlp terminou com código {result.returncode}')
+
+
+def _dominio(url) -> str:
+    """Domínio para o controle de concorrência: a plataforma, ou o host nas demais"""
+    ref = normalizar_url(url)
+    if ref.plataforma != 'Outra':
+        return ref.plataforma
+    return urlsplit(ref.url_canonica).hostname or ref.url_canonica
+
+
+def _bloqueio(resultado: Dict) -> bool:
+    """Indica se a extração falhou por bloqueio/sobrecarga do domínio (timeout, 429, 403)"""
+    return resultado['status'] != 'ok' and bool(ERRO_BLOQUEIO.search(resultado['status']))
+
+
+def _resultado_disjuntor(dominio: str) -> Dict:
+    """Resultado de uma URL recusada porque o disjuntor do domínio está aberto"""
+    return {
+        'segundos': 0,
+        'formatada': 'Erro',
+        'status': f'erro: {dominio} bloqueado temporariamente (muitas falhas seguidas)',
+        # Falha passageira: não vai para o cache nem para o diário de jobs
+        'transitorio': True
+    }
+
+
+def extrair_em_paralelo(urls: List[str], max_workers: int = DEFAULT_WORKERS,
+                        on_progress: Optional[Callable] = None,
+                        on_result: Optional[Callable] = None,
+                        scheduler: Optional[DomainScheduler] = None) -> List[Dict]:
+    """
+    Extrai a duração de várias URLs com um pool limitado de workers
+
+    As vagas do pool são distribuídas entre os domínios em rodízio, respeitando o
+    limite adaptativo de cada um (ver domain_scheduler). Um domínio bloqueado
+    (timeouts, 429, 403) perde vagas e, após falhas seguidas por bloqueio, tem as
+    URLs restantes recusadas na hora enquanto o disjuntor está aberto, sem atrasar
+    os demais. Falhas por bloqueio e URLs recusadas são marcadas como
+    'transitorio': não vão para o cache nem para o diário e são tentadas de novo
+    na próxima execução do job. Erros do próprio vídeo (privado, removido) não
+    contam para o disjuntor.
+
+    Args:
+        urls: URLs a processar
+        max_workers: Extrações simultâneas (total, somando todos os domínios)
+        on_progress: Chamada como on_progress(concluidas, total, url) a cada URL
+            concluída, na thread de quem chamou (seguro para atualizar o Streamlit)
+        on_result: Chamada como on_result(i, resultado) assim que a URL i termina,
+            também na thread de quem chamou
+        scheduler: Estado de concorrência por domínio; reaproveite a mesma instância
+            entre chamadas para manter limites e disjuntores
+
+    Returns:
+        Resultados de extrair_duracao_url na mesma ordem de `urls`
+    """
+    resultados = [None] * len(urls)
+
+    if not urls:
+        return resultados
+
+    max_workers = max(1, max_workers)
+    if scheduler is None:
+        scheduler = DomainScheduler(max_per_domain=max_workers)
+
+    filas = defaultdict(deque)
+    for i, url in enumerate(urls):
+        filas[_dominio(url)].append(i)
+
+    em_andamento = {}
+    concluidas = 0
+
+    def concluir(i, resultado):
+        nonlocal concluidas
+        concluidas += 1
+        resultados[i] = resultado
+        if on_result:
+            on_result(i, resultado)
+        if on_progress:
+            on_progress(concluidas, len(urls), urls[i])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while filas or em_andamento:
+            # Rodízio: cada domínio ocupa no máximo uma vaga por volta
+            iniciou = True
+            while iniciou and len(em_andamento) < max_workers:
+                iniciou = False
+                for dominio in list(filas):
+                    fila = filas[dominio]
+                    if scheduler.is_open(dominio):
+                        # Disjuntor aberto: falha na hora (transitório), sem ocupar o pool
+                        while fila:
+                            concluir(fila.popleft(), _resultado_disjuntor(dominio))
+                    elif len(em_andamento) < max_workers and scheduler.can_start(dominio):
+                        i = fila.popleft()
+                        scheduler.started(dominio)
+                        future = executor.submit(extrair_duracao_url, urls[i])
+                        em_andamento[future] = (i, dominio, time.monotonic())
+                        iniciou = True
+                    if not fila:
+                        del filas[dominio]
+
+            if not em_andamento:
+                continue
+
+            prontos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+            for future in prontos:
+                i, dominio, inicio = em_andamento.pop(future)
+                resultado = future.result()
+                bloqueio = _bloqueio(resultado)
+                scheduler.finished(dominio, not bloqueio, time.monotonic() - inicio)
+                if bloqueio:
+                    resultado = dict(resultado, transitorio=True)
+                concluir(i, resultado)
+
+    return resultados
+
+
+def resolver_youtube_api(video_ids: List[str], api_key: str) -> Dict[str, Dict]:
+    """
+    Metadados de vídeos do YouTube via videos.list (50 IDs por chamada)
+
+    Returns:
+        {video_id: resultado no formato de extrair_duracao_url}; IDs ausentes
+        (erro da API, vídeo privado, duração zero) devem seguir para o yt-dlp
+    """
+    scraper = SocialMediaScraper()
+    scraper.configure_apis(youtube_key=api_key)
+
+    try:
+        videos = scraper.lookup_youtube_videos(video_ids)
+    except Exception as e:
+        print(f"⚠️  API do YouTube indisponível, usando yt-dlp: {str(e)}")
+        return {}
+
+    return {
+        video_id: {
+            'segundos': video['duracao_segundos'],
+            'formatada': video['duracao_formatada'],
+            'titulo': video['titulo'],
+            'criador': video['perfil'],
+            'status': 'ok'
+        }
+        for video_id, video in videos.items()
+        if video['duracao_segundos']
+    }
+
+
+def resolver_metadados(refs: List[VideoRef], max_workers: int = DEFAULT_WORKERS,
+                       on_progress: Optional[Callable] = None,
+                       cache: Optional[MetadataCache] = None,
+                       youtube_api_key: Optional[str] = None,
+                       on_resolved: Optional[Callable] = None,
+                       scheduler: Optional[DomainScheduler] = None) -> Dict:
+    """
+    Resolve os metadados de vídeos únicos: cache, depois API do YouTube, depois yt-dlp
+
+    Args:
+        refs: Vídeos únicos (ver url_normalizer.normalizar_url)
+        max_workers: Extrações simultâneas do yt-dlp
+        on_progress: Ver extrair_em_paralelo (total = len(refs))
+        cache: Cache de metadados; vídeos já guardados não são consultados de novo
+        youtube_api_key: Se informada, vídeos do YouTube são resolvidos em lote
+            por videos.list em vez de um yt-dlp por URL
+        on_resolved: Chamada como on_resolved(ref, resultado) assim que cada vídeo
+            é resolvido, na thread de quem chamou (falhas passageiras, como o
+            bloqueio de um domínio, não são informadas nem guardadas no cache)
+        scheduler: Ver extrair_em_paralelo
+
+    Returns:
+        {ref.chave: resultado no formato de extrair_duracao_url}
+    """
+    total = len(refs)
+    resultados = {}
+
+    def registrar(ref, resultado, salvar=True):
+        resultados[ref.chave] = resultado
+        if resultado.get('transitorio'):
+            return
+        if cache and salvar:
+            cache.set(*ref.chave, resultado)
+        if on_resolved:
+            on_resolved(ref, resultado)
+
+    def progresso(url):
+        if on_progress:
+            on_progress(len(resultados), total, url)
+
+    if cache:
+        for ref in refs:
+            guardado = cache.get(*ref.chave)
+            if guardado is not None:
+                registrar(ref, guardado, salvar=False)
+                progresso(ref.url_canonica)
+
+    # Vídeos do YouTube com ID: videos.list em lotes de 50
+    if youtube_api_key:
+        do_youtube = [
+            ref for ref in refs
+            if ref.chave not in resultados and ref.plataforma == 'YouTube' and ref.video_id
+        ]
+        if do_youtube:
+            via_api = resolver_youtube_api([ref.video_id for ref in do_youtube], youtube_api_key)
+            for ref in do_youtube:
+                if ref.video_id in via_api:
+                    registrar(ref, via_api[ref.video_id])
+                    progresso(ref.url_canonica)
+
+    # Demais plataformas, links sem ID e falhas da API: yt-dlp
+    restantes = [ref for ref in refs if ref.chave not in resultados]
+    ja_resolvidos = len(resultados)
+
+    def progresso_ytdlp(concluidas, _, url):
+        if on_progress:
+            on_progress(ja_resolvidos + concluidas, total, url)
+
+    extrair_em_paralelo(
+        [ref.url_canonica for ref in restantes], max_workers, progresso_ytdlp,
+        on_result=lambda i, resultado: registrar(restantes[i], resultado),
+        scheduler=scheduler
+    )
+
+    return resultados
+
+
+def processar_urls(df: pd.DataFrame, coluna_url: str, tempo_minimo_seg: float,
+                   max_workers: int = DEFAULT_WORKERS,
+                   on_progress: Optional[Callable] = None,
+                   cache: Optional[MetadataCache] = None,
+                   youtube_api_key: Optional[str] = None,
+                   journal: Optional[JobJournal] = None, job_id: Optional[str] = None,
+                   scheduler: Optional[DomainScheduler] = None) -> Dict:
+    """
+    Preenche a minutagem de cada linha da planilha (sem dependência do Streamlit)
+
+    Args:
+        df: Planilha com uma coluna de URLs (alterada no lugar)
+        coluna_url: Nome da coluna com as URLs
+        tempo_minimo_seg: Duração mínima para marcar o vídeo como monetizável
+        max_workers: Extrações simultâneas
+        on_progress: Ver extrair_em_paralelo (total = vídeos únicos)
+        cache: Cache de metadados (ver resolver_metadados)
+        youtube_api_key: Resolve links do YouTube pela API (ver resolver_metadados)
+        journal: Diário de jobs; cada linha concluída é gravada na hora e, ao
+            repetir o mesmo job_id, as linhas já extraídas com sucesso não são
+            processadas de novo (as com erro passam pelo cache, que expira falhas)
+        job_id: Identificador do job (ver JobJournal.make_job_id)
+        scheduler: Concorrência adaptativa por domínio (ver extrair_em_paralelo)
+
+    Returns:
+        Dicionário com 'df', 'sucesso' e 'erro'
+    """
+    urls = df[coluna_url]
+    texto = urls.astype(str).str.strip()
+    vazia = (urls.isna() | texto.eq('') | texto.eq('nan')).to_numpy()
+    validas = texto[~vazia]
+
+    # Cada URL distinta é normalizada uma vez
+    por_url = {url: normalizar_url(url) for url in validas.unique()}
+    refs = [por_url[url] for url in validas]
+    posicoes_validas = np.flatnonzero(~vazia).tolist()
+
+    usar_journal = journal is not None and job_id is not None
+    restaurados = {}
+    if usar_journal:
+        journal.start(job_id, len(df))
+        restaurados = {
+            pos: resultado for pos, resultado in journal.completed(job_id).items()
+            if resultado['status'] == 'ok'
+        }
+
+    # Cada vídeo é extraído uma única vez, mesmo que apareça em várias linhas
+    unicos = {}
+    posicoes = defaultdict(list)
+    for pos, ref in zip(posicoes_validas, refs):
+        if pos not in restaurados:
+            unicos.setdefault(ref.chave, ref)
+            posicoes[ref.chave].append(pos)
+
+    def gravar_no_journal(ref, resultado):
+        journal.record(job_id, posicoes[ref.chave], resultado)
+
+    por_chave = resolver_metadados(
+        list(unicos.values()), max_workers, on_progress, cache, youtube_api_key,
+        on_resolved=gravar_no_journal if usar_journal else None,
+        scheduler=scheduler
+    )
+    # O job só termina quando todas as linhas com URL estão no diário
+    # (falhas passageiras, como bloqueios de domínio, ficam para a próxima execução)
+    if usar_journal and not any(resultado.get('transitorio') for resultado in por_chave.values()):
+        journal.finish(job_id)
+
+    # Resultados alinhados às linhas com URL, na ordem original
+    resultados = pd.DataFrame.from_records(
+        [
+            restaurados[pos] if pos in restaurados else por_chave[ref.chave]
+            for pos, ref in zip(posicoes_validas, refs)
+        ],
+        columns=['segundos', 'formatada', 'titulo', 'criador', 'status']
+    )
+    ok = resultados['status'].eq('ok').to_numpy()
+    segundos = pd.to_numeric(resultados['segundos'].fillna(0)).to_numpy()
+
+    def coluna(valores, padrao):
+        """Coluna completa: valores nas linhas com URL, padrão nas linhas vazias"""
+        completa = np.full(len(df), padrao, dtype=object if isinstance(padrao, str) else segundos.dtype)
+        completa[~vazia] = valores
+        return completa
+
+    # Colunas resultado, uma atribuição por coluna
+    df['Plataforma'] = coluna([ref.plataforma for ref in refs], '')
+    df['Criador'] = coluna(np.where(ok, resultados['criador'].fillna('Desconhecido'), ''), '')
+    df['Título'] = coluna(np.where(ok, resultados['titulo'].fillna('Sem título'), ''), '')
+    df['Duração (seg)'] = coluna(segundos, 0)
+    df['Duração'] = coluna(resultados['formatada'].to_numpy(), '')
+    df['Status'] = coluna(resultados['status'].to_numpy(), 'URL vazia')
+    df['Monetizável'] = coluna(np.where(ok & (segundos >= tempo_minimo_seg), '✅', '❌'), '')
+
+    sucesso = int(ok.sum())
+    return {'df': df, 'sucesso': sucesso, 'erro': len(ok) - sucesso}
@@ -0,0 +1,90 @@
+"""
+Normalização de URLs de vídeos
+Identifica plataforma e ID canônico de links do YouTube, TikTok e Instagram,
+descartando parâmetros de rastreamento, para que o mesmo vídeo seja extraído uma vez só
+"""
+
+import re
+from typing import NamedTuple, Optional
+from urllib.parse import parse_qs, urlsplit
+
+YOUTUBE_HOSTS = {'youtube.com', 'music.youtube.com', 'youtube-nocookie.com', 'youtu.be'}
+TIKTOK_HOSTS = {'tiktok.com', 'vm.tiktok.com', 'vt.tiktok.com'}
+INSTAGRAM_HOSTS = {'instagram.com', 'instagr.am'}
+
+YOUTUBE_ID = re.compile(r'^[A-Za-z0-9_-]{11}$')
+YOUTUBE_PATH_ID = re.compile(r'^/(?:shorts|embed|live|v)/([A-Za-z0-9_-]{11})')
+TIKTOK_PATH_ID = re.compile(r'/(?:video|v|embed(?:/v2)?)/(\d+)')
+INSTAGRAM_PATH_ID = re.compile(r'^/(?:[\w.]+/)?(reel|reels|p|tv)/([A-Za-z0-9_-]+)')
+
+
+class VideoRef(NamedTuple):
+    """Vídeo identificado a partir de uma URL"""
+    plataforma: str               # 'YouTube', 'TikTok', 'Instagram' ou 'Outra'
+    video_id: Optional[str]       # None quando o ID não pode ser extraído da URL
+    url_canonica: str             # URL sem rastreamento, usada na extração
+
+    @property
+    def chave(self):
+        """Chave de deduplicação: (plataforma, id) ou a própria URL canônica"""
+        return (self.plataforma, self.video_id) if self.video_id else (self.plataforma, self.url_canonica)
+
+
+def normalizar_url(url: str) -> VideoRef:
+    """
+    Extrai plataforma, ID e URL canônica de um link de vídeo
+
+    Exemplos que resultam no mesmo VideoRef:
+        https://youtu.be/X, https://www.youtube.com/watch?v=X&t=10,
+        https://m.youtube.com/shorts/X?feature=share
+    """
+    url = str(url).strip()
+    partes = urlsplit(url if '://' in url else f'https://{url}')
+    host = (partes.hostname or '').lower()
+    for prefixo in ('www.', 'm.'):
+        if host.startswith(prefixo):
+            host = host[len(prefixo):]
+    caminho = partes.path
+
+    if host in YOUTUBE_HOSTS:
+        video_id = None
+        if host == 'youtu.be':
+            candidato = caminho.strip('/').split('/')[0]
+            video_id = candidato if YOUTUBE_ID.match(candidato) else None
+        else:
+            candidato = parse_qs(partes.query).get('v', [''])[0]
+            match = YOUTUBE_PATH_ID.match(caminho)
+            if YOUTUBE_ID.match(candidato):
+                video_id = candidato
+            elif match:
+                video_id = match.group(1)
+
+        if video_id:
+            return VideoRef('YouTube', video_id, f'https://www.youtube.com/watch?v={video_id}')
+        return VideoRef('YouTube', None, _sem_rastreamento(partes))
+
+    if host in TIKTOK_HOSTS:
+        match = TIKTOK_PATH_ID.search(caminho)
+        if match:
+            video_id = match.group(1)
+            usuario = re.match(r'^/(@[\w.-]+)/video/', caminho)
+            if usuario:
+                return VideoRef('TikTok', video_id, f'https://www.tiktok.com/{usuario.group(1)}/video/{video_id}')
+            return VideoRef('TikTok', video_id, f'https://www.tiktok.com/embed/{video_id}')
+        # Links curtos (vm.tiktok.com/XYZ) só revelam o ID após o redirecionamento
+        return VideoRef('TikTok', None, _sem_rastreamento(partes))
+
+    if host in INSTAGRAM_HOSTS:
+        match = INSTAGRAM_PATH_ID.match(caminho)
+        if match:
+            tipo = 'reel' if match.group(1) == 'reels' else match.group(1)
+            video_id = match.group(2)
+            return VideoRef('Instagram', video_id, f'https://www.instagram.com/{tipo}/{video_id}/')
+        return VideoRef('Instagram', None, _sem_rastreamento(partes))
+
+    return VideoRef('Outra', None, url)
+
+
+def _sem_rastreamento(partes) -> str:
+    """URL sem query string e fragmento (utm_*, igsh, is_from_webapp...)"""
+    return f'https://{partes.netloc}{partes.path}'
@@ -0,0 +1,101 @@
+"""
+Marcas d'água de coleta incremental (SQLite)
+Guarda, por (plataforma, hashtag), a data do conteúdo mais recente já coletado e,
+quando uma coleta parou em max_results, o ponto de onde a próxima deve continuar
+"""
+
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+
+class WatermarkStore:
+    """Marca d'água (data de publicação mais recente) por plataforma e hashtag"""
+
+    def __init__(self, path: str = 'watermarks.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS watermarks (
+                plataforma TEXT NOT NULL,
+                hashtag TEXT NOT NULL,
+                published_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                resume_before TEXT,
+                resume_newest TEXT,
+                PRIMARY KEY (plataforma, hashtag)
+            )
+        """)
+        # Arquivos criados antes do ponto de retomada
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(watermarks)")}
+        for column in ('resume_before', 'resume_newest'):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE watermarks ADD COLUMN {column} TEXT")
+        self._conn.commit()
+
+    def get(self, plataforma: str, hashtag: str) -> Optional[str]:
+        """Data (ISO 8601, UTC) do conteúdo mais recente já coletado, ou None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT published_at FROM watermarks WHERE plataforma = ? AND hashtag = ?",
+                (plataforma, hashtag.lower())
+            ).fetchone()
+        return row[0] if row else None
+
+    def advance(self, plataforma: str, hashtag: str, published_at: str):
+        """Avança a marca d'água (nunca retrocede) e descarta o ponto de retomada"""
+        current = self.get(plataforma, hashtag)
+        if current and current >= published_at:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO watermarks (plataforma, hashtag, published_at, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (plataforma, hashtag.lower(), published_at, datetime.now(timezone.utc).isoformat(timespec='seconds'))
+            )
+            self._conn.commit()
+
+    def resume_point(self, plataforma: str, hashtag: str) -> Optional[Tuple[str, str]]:
+        """
+        Ponto de retomada de uma coleta que parou em max_results, ou None
+
+        Returns:
+            (data do conteúdo mais antigo já coletado, data do mais recente): ainda
+            falta o intervalo entre a marca d'água e o primeiro valor
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT resume_before, resume_newest FROM watermarks WHERE plataforma = ? AND hashtag = ?",
+                (plataforma, hashtag.lower())
+            ).fetchone()
+        return (row[0], row[1]) if row and row[0] else None
+
+    def set_resume_point(self, plataforma: str, hashtag: str, before: str, newest: str):
+        """
+        Registra que a próxima coleta deve buscar conteúdo publicado até `before`;
+        ao terminar esse intervalo, a marca d'água avança para `newest`
+        (exige uma marca d'água já gravada)
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE watermarks SET resume_before = ?, resume_newest = ?, updated_at = ? "
+                "WHERE plataforma = ? AND hashtag = ?",
+                (before, newest, datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                 plataforma, hashtag.lower())
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def next_after(published_at: str) -> str:
+        """Primeiro instante depois da marca d'água (publishedAfter do YouTube é inclusivo)"""
+        moment = datetime.strptime(published_at[:19], '%Y-%m-%dT%H:%M:%S')
+        return (moment + timedelta(seconds=1)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    @staticmethod
+    def last_before(published_at: str) -> str:
+        """Último instante antes do ponto de retomada (publishedBefore também é inclusivo)"""
+        moment = datetime.strptime(published_at[:19], '%Y-%m-%dT%H:%M:%S')
+        return (moment - timedelta(seconds=1)).strftime('%Y-%m-%dT%H:%M:%SZ')